@@ -272,35 +272,39 @@ class Jarvis:
         startup_message = self.personality.get_startup_message()
         self._speak(startup_message)
 
-        while self.running and not self._shutdown_requested:
-            try:
-                # Wait for wake word
-                logger.info("Waiting for wake word...")
-                self.wake_word.listen_once(timeout=None)
+        try:
+            while self.running and not self._shutdown_requested:
+                try:
+                    # Wait for wake word
+                    logger.info("Waiting for wake word...")
+                    self.wake_word.listen_once(timeout=None)
 
-                if not self.running:
-                    break
-
-                # Handle interaction
-                self._handle_interaction()
+                    if not self.running:
+                        break
 
-            except KeyboardInterrupt:
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                continue
+                    # Handle interaction
+                    self._handle_interaction()
 
-        logger.info("JARVIS shutting down...")
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in main loop: {e}")
+                    continue
+        finally:
+            # Databases are closed only here, never from the signal handler
+            logger.info("JARVIS shutting down...")
 
-        # Stop system monitoring
-        self.system_monitor.stop_monitoring()
+            # Stop system monitoring
+            self.system_monitor.stop_monitoring()
 
-        # Stop reminder and calendar monitoring
-        self.reminder_manager.stop()
-        self.calendar_manager.stop_monitoring()
+            # Stop reminder and calendar monitoring
+            self.reminder_manager.stop()
+            self.reminder_manager.db.close()
+            self.calendar_manager.stop_monitoring()
 
-        # End memory session
-        self.memory_handler.end_session()
+            # End memory session
+            self.memory_handler.end_session()
+            self.memory.close()
 
         shutdown_message = self.personality.get_shutdown_message()
         self._speak(shutdown_message)
@@ -521,7 +525,7 @@ class Jarvis:
         pass
 
     def shutdown(self):
-        """Shutdown JARVIS."""
+        """Shutdown JARVIS (run() closes the databases on its way out)."""
         self.running = False
         self._shutdown_requested = True
         self.system_monitor.stop_monitoring()
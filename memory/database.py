@@ -6,37 +6,131 @@ Persistent storage using SQLite for memories, preferences, and conversation hist
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    logger.warning("msgpack not available, preferences will be stored as JSON")
+
+# Hot-path statements kept as constants so the connection's statement
+# cache always sees the exact same SQL text.
+SQL_SET_PREFERENCE = """
+    INSERT OR REPLACE INTO preferences (key, value, updated_at)
+    VALUES (?, ?, ?)
+"""
+SQL_GET_PREFERENCE = "SELECT value FROM preferences WHERE key = ?"
+# Marks preferences whose stored encoding can't be read in this environment
+_UNREADABLE = object()
+SQL_ADD_MEMORY = """
+    INSERT INTO memories (category, content, keywords, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+
 
 class MemoryDatabase:
     """SQLite-based persistent memory for JARVIS."""
 
+    # Applied once per connection; WAL lets readers run alongside the writer
+    # and synchronous=NORMAL only fsyncs at checkpoints instead of every commit.
+    PRAGMAS = """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-8000;
+        PRAGMA busy_timeout=5000;
+        PRAGMA wal_autocheckpoint=1000;
+    """
+
     def __init__(self, db_path: str = "memory/jarvis_memory.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._in_batch = False
+        self._fts_enabled = False
+        self._conn = self._connect()
         self._init_database()
         logger.info(f"Memory database initialized at {self.db_path}")
 
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "MemoryDatabase":
+        """Wrap a connection that already holds the schema (e.g. an in-memory clone)."""
+        db = cls.__new__(cls)
+        db.db_path = Path(":memory:")
+        db._lock = threading.RLock()
+        db._in_batch = False
+        conn.row_factory = sqlite3.Row
+        db._conn = conn
+        db._fts_enabled = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'memories_fts'"
+        ).fetchone() is not None
+        return db
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived connection and apply tuning PRAGMAs."""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.executescript(self.PRAGMAS)
+        return conn
+
+    def close(self) -> None:
+        """Checkpoint the WAL into the main file and close the connection."""
+        with self._lock:
+            # Safe to call twice (e.g. from a signal handler and then run())
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                self._conn.close()
+                self._conn = None
+        logger.info(f"Memory database closed: {self.db_path}")
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            conn.close()
+        """Context manager yielding the shared connection inside a transaction."""
+        with self._lock:
+            conn = self._conn
+            if self._in_batch:
+                # The enclosing batch() owns commit/rollback
+                yield conn
+                return
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+
+    @contextmanager
+    def batch(self):
+        """Run several writes inside a single transaction (one commit)."""
+        with self._lock:
+            if self._in_batch:
+                yield self
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_batch = True
+            try:
+                yield self
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                logger.error(f"Database error in batch: {e}")
+                raise
+            finally:
+                self._in_batch = False
 
     def _init_database(self):
         """Initialize database tables."""
@@ -95,35 +189,119 @@ class MemoryDatabase:
                 CREATE INDEX IF NOT EXISTS idx_memories_keywords
                 ON memories(keywords)
             """)
+            # (session_id, timestamp) serves both the session filter and the
+            # ORDER BY in get_conversation_history, so no temp B-tree sort.
+            # preferences(key) is already indexed through its PRIMARY KEY.
+            cursor.execute("DROP INDEX IF EXISTS idx_conversations_session")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_conversations_session_time
+                ON conversations(session_id, timestamp)
+            """)
+
+            self._fts_enabled = self._init_fts(cursor)
+
+    def _init_fts(self, cursor) -> bool:
+        """Create the FTS5 index over memories; False if FTS5 is unavailable."""
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'memories_fts'"
+            )
+            exists = cursor.fetchone() is not None
+
+            # Trigram tokenizer keeps the substring semantics of LIKE '%q%'
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                    content, keywords,
+                    content='memories', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_fts_insert
+                AFTER INSERT ON memories BEGIN
+                    INSERT INTO memories_fts(rowid, content, keywords)
+                    VALUES (new.id, new.content, new.keywords);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_fts_delete
+                AFTER DELETE ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content, keywords)
+                    VALUES ('delete', old.id, old.content, old.keywords);
+                END
+            """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversations_session
-                ON conversations(session_id)
+                CREATE TRIGGER IF NOT EXISTS memories_fts_update
+                AFTER UPDATE OF content, keywords ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content, keywords)
+                    VALUES ('delete', old.id, old.content, old.keywords);
+                    INSERT INTO memories_fts(rowid, content, keywords)
+                    VALUES (new.id, new.content, new.keywords);
+                END
             """)
 
+            # Index memories stored before the FTS table existed
+            if not exists:
+                cursor.execute(
+                    "INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')"
+                )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, using LIKE search: {e}")
+            return False
+
+    def _text_condition(self, text: str) -> Tuple[str, List[Any]]:
+        """Build a WHERE condition matching text in content or keywords."""
+        # Trigram MATCH needs at least 3 characters; shorter terms use LIKE
+        if self._fts_enabled and len(text) >= 3:
+            phrase = '"' + text.replace('"', '""') + '"'
+            return (
+                "id IN (SELECT rowid FROM memories_fts WHERE memories_fts MATCH ?)",
+                [phrase]
+            )
+        return ("(content LIKE ? OR keywords LIKE ?)", [f"%{text}%", f"%{text}%"])
+
     # ==================== Preferences ====================
 
+    @staticmethod
+    def _encode_preference(value: Any) -> Any:
+        """Serialize a preference value for storage."""
+        if isinstance(value, str):
+            return value
+        # Containers go to a compact msgpack BLOB; scalars stay JSON text
+        if MSGPACK_AVAILABLE and not isinstance(value, (int, float, type(None))):
+            return msgpack.packb(value)
+        return json.dumps(value)
+
+    @staticmethod
+    def _decode_preference(raw: Any, default: Any = None) -> Any:
+        """Deserialize a stored preference value (msgpack BLOB or JSON text)."""
+        if isinstance(raw, bytes):
+            if not MSGPACK_AVAILABLE:
+                logger.warning("Preference stored as msgpack but msgpack is not installed")
+                return default
+            return msgpack.unpackb(raw, strict_map_key=False)
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw
+
     def set_preference(self, key: str, value: Any) -> None:
         """Set a user preference."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            json_value = json.dumps(value) if not isinstance(value, str) else value
-            cursor.execute("""
-                INSERT OR REPLACE INTO preferences (key, value, updated_at)
-                VALUES (?, ?, ?)
-            """, (key, json_value, datetime.now()))
+            stored_value = self._encode_preference(value)
+            cursor.execute(SQL_SET_PREFERENCE, (key, stored_value, datetime.now()))
         logger.debug(f"Preference set: {key}")
 
     def get_preference(self, key: str, default: Any = None) -> Any:
         """Get a user preference."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT value FROM preferences WHERE key = ?", (key,))
+            cursor.execute(SQL_GET_PREFERENCE, (key,))
             row = cursor.fetchone()
             if row:
-                try:
-                    return json.loads(row["value"])
-                except json.JSONDecodeError:
-                    return row["value"]
+                return self._decode_preference(row["value"], default)
             return default
 
     def get_all_preferences(self) -> Dict[str, Any]:
@@ -131,13 +309,12 @@ class MemoryDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT key, value FROM preferences")
-            result = {}
-            for row in cursor.fetchall():
-                try:
-                    result[row["key"]] = json.loads(row["value"])
-                except json.JSONDecodeError:
-                    result[row["key"]] = row["value"]
-            return result
+            prefs = {
+                row["key"]: self._decode_preference(row["value"], _UNREADABLE)
+                for row in cursor.fetchall()
+            }
+            # Leave out msgpack values that can't be decoded without msgpack
+            return {k: v for k, v in prefs.items() if v is not _UNREADABLE}
 
     def delete_preference(self, key: str) -> bool:
         """Delete a user preference."""
@@ -158,14 +335,26 @@ class MemoryDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             keywords_str = ",".join(keywords) if keywords else ""
-            cursor.execute("""
-                INSERT INTO memories (category, content, keywords, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (category, content, keywords_str, datetime.now()))
+            cursor.execute(SQL_ADD_MEMORY, (category, content, keywords_str, datetime.now()))
             memory_id = cursor.lastrowid
         logger.info(f"Memory added: {content[:50]}...")
         return memory_id
 
+    def add_memories(
+        self,
+        memories: Iterable[Tuple[str, str, Optional[List[str]]]]
+    ) -> int:
+        """Add several (content, category, keywords) memories in one statement."""
+        now = datetime.now()
+        rows = [
+            (category, content, ",".join(keywords) if keywords else "", now)
+            for content, category, keywords in memories
+        ]
+        with self._get_connection() as conn:
+            conn.executemany(SQL_ADD_MEMORY, rows)
+        logger.info(f"Memories added: {len(rows)}")
+        return len(rows)
+
     def search_memories(
         self,
         query: str = "",
@@ -180,8 +369,9 @@ class MemoryDatabase:
             params = []
 
             if query:
-                conditions.append("(content LIKE ? OR keywords LIKE ?)")
-                params.extend([f"%{query}%", f"%{query}%"])
+                condition, condition_params = self._text_condition(query)
+                conditions.append(condition)
+                params.extend(condition_params)
 
             if category:
                 conditions.append("category = ?")
@@ -239,10 +429,8 @@ class MemoryDatabase:
         """Delete all memories containing a specific topic."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                DELETE FROM memories
-                WHERE content LIKE ? OR keywords LIKE ?
-            """, (f"%{topic}%", f"%{topic}%"))
+            condition, params = self._text_condition(topic)
+            cursor.execute(f"DELETE FROM memories WHERE {condition}", params)
             count = cursor.rowcount
         logger.info(f"Forgot {count} memories about: {topic}")
         return count
@@ -293,6 +481,25 @@ class MemoryDatabase:
                 WHERE session_id = ?
             """, (session_id,))
 
+    def add_conversations(
+        self,
+        session_id: str,
+        messages: Iterable[Tuple[str, str]]
+    ) -> None:
+        """Add several (role, content) messages to a session in one statement."""
+        now = datetime.now()
+        rows = [(session_id, role, content, now) for role, content in messages]
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO conversations (session_id, role, content, timestamp)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.execute("""
+                UPDATE sessions
+                SET message_count = message_count + ?
+                WHERE session_id = ?
+            """, (len(rows), session_id))
+
     def get_conversation_history(
         self,
         session_id: str,
@@ -309,13 +516,7 @@ class MemoryDatabase:
                 LIMIT ?
             """, (session_id, limit))
 
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    "role": row["role"],
-                    "content": row["content"],
-                    "timestamp": row["timestamp"]
-                })
+            results = [dict(row) for row in cursor.fetchall()]
             return list(reversed(results))
 
     def get_recent_sessions(self, limit: int = 5) -> List[Dict[str, Any]]:
@@ -329,15 +530,7 @@ class MemoryDatabase:
                 LIMIT ?
             """, (limit,))
 
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    "session_id": row["session_id"],
-                    "started_at": row["started_at"],
-                    "ended_at": row["ended_at"],
-                    "message_count": row["message_count"]
-                })
-            return results
+            return [dict(row) for row in cursor.fetchall()]
 
     def get_context_from_history(self, limit: int = 5) -> str:
         """Get recent conversation context as formatted string."""
@@ -397,9 +590,22 @@ class MemoryDatabase:
 
     def export_memories(self) -> Dict[str, Any]:
         """Export all data for backup."""
+        with self._get_connection() as conn:
+            # Read straight from the tables: unlike search_memories this
+            # does not bump access counters and is not capped at 1000 rows
+            memories = [dict(row) for row in conn.execute("""
+                SELECT id, category, content, keywords, created_at,
+                       last_accessed, access_count
+                FROM memories
+                ORDER BY created_at
+            """)]
+
+        for memory in memories:
+            memory["keywords"] = memory["keywords"].split(",") if memory["keywords"] else []
+
         return {
             "preferences": self.get_all_preferences(),
-            "memories": self.get_all_memories(),
+            "memories": memories,
             "sessions": self.get_recent_sessions(limit=100),
             "exported_at": datetime.now().isoformat()
         }
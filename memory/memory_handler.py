@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 class MemoryHandler:
     """Handles memory-related commands and context management."""
 
+    __slots__ = ("db", "current_session_id")
+
     # Patterns for detecting memory commands
     REMEMBER_PATTERNS = [
         r"recuerda\s+que\s+(.+)",
@@ -43,6 +45,50 @@ class MemoryHandler:
         r"puedes\s+llamarme\s+(\w+)",
     ]
 
+    STATUS_PATTERNS = [
+        r"qu[eé]\s+recuerdas",
+        r"qu[eé]\s+sabes\s+(?:de|sobre)\s+m[ií]",
+        r"cu[aá]nto\s+recuerdas",
+        r"lista\s+(?:de\s+)?recuerdos",
+        r"muestra\s+(?:tus\s+)?recuerdos",
+    ]
+
+    # Category keywords, in priority order (first matching category wins)
+    CATEGORY_KEYWORDS = {
+        "personal": ["nombre", "cumpleaños", "familia", "esposa", "hijo", "hija"],
+        "trabajo": ["cliente", "proyecto", "reunión", "trabajo", "empresa", "jefe"],
+        "preferencias": ["me gusta", "prefiero", "favorito", "odio", "no me gusta"],
+        "contactos": ["teléfono", "email", "correo", "dirección", "número"],
+        "fechas": ["fecha", "aniversario", "día", "cumple"],
+    }
+
+    # Patterns compiled once at import instead of on every process_input
+    _REMEMBER_RE = [re.compile(p) for p in REMEMBER_PATTERNS]
+    _FORGET_RE = [re.compile(p) for p in FORGET_PATTERNS]
+    _RECALL_RE = [re.compile(p) for p in RECALL_PATTERNS]
+    _NAME_RE = [re.compile(p) for p in NAME_PATTERNS]
+    _STATUS_RE = re.compile("|".join(STATUS_PATTERNS))
+    _KEYWORD_RE = re.compile(r'\b\w{3,}\b')
+
+    # Union of every command pattern: inputs it does not match cannot be a
+    # memory command, so most queries are rejected after a single scan.
+    _ANY_COMMAND_RE = re.compile("|".join(
+        NAME_PATTERNS + REMEMBER_PATTERNS + FORGET_PATTERNS
+        + RECALL_PATTERNS + STATUS_PATTERNS
+    ))
+
+    # Single-pass matcher over every category keyword. The lookahead reports
+    # a match at each start position (so keywords nested inside longer ones
+    # are still seen) and alternatives are ordered by category priority.
+    _KEYWORD_CATEGORY = {
+        kw: category
+        for category, keywords in CATEGORY_KEYWORDS.items()
+        for kw in keywords
+    }
+    _CATEGORY_RE = re.compile(
+        "(?=(" + "|".join(re.escape(kw) for kw in _KEYWORD_CATEGORY) + "))"
+    )
+
     def __init__(self, db: Optional[MemoryDatabase] = None):
         self.db = db or get_memory()
         self.current_session_id: Optional[str] = None
@@ -74,6 +120,9 @@ class MemoryHandler:
         """
         user_input_lower = user_input.lower().strip()
 
+        if not self._ANY_COMMAND_RE.search(user_input_lower):
+            return (False, None)
+
         # Check for name setting
         name_response = self._check_name_setting(user_input_lower, user_input)
         if name_response:
@@ -106,8 +155,8 @@ class MemoryHandler:
         original_input: str
     ) -> Optional[str]:
         """Check if user is introducing themselves."""
-        for pattern in self.NAME_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern in self._NAME_RE:
+            match = pattern.search(input_lower)
             if match:
                 name = match.group(1).capitalize()
                 self.db.set_user_name(name)
@@ -126,8 +175,8 @@ class MemoryHandler:
         original_input: str
     ) -> Optional[str]:
         """Check if user is asking to remember something."""
-        for pattern in self.REMEMBER_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern in self._REMEMBER_RE:
+            match = pattern.search(input_lower)
             if match:
                 # Use original input to preserve case
                 content_start = match.start(1)
@@ -154,8 +203,8 @@ class MemoryHandler:
 
     def _check_forget_command(self, input_lower: str) -> Optional[str]:
         """Check if user is asking to forget something."""
-        for pattern in self.FORGET_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern in self._FORGET_RE:
+            match = pattern.search(input_lower)
             if match:
                 topic = match.group(1).strip()
                 count = self.db.forget_about(topic)
@@ -167,8 +216,8 @@ class MemoryHandler:
 
     def _check_recall_command(self, input_lower: str) -> Optional[str]:
         """Check if user is asking to recall something."""
-        for pattern in self.RECALL_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern in self._RECALL_RE:
+            match = pattern.search(input_lower)
             if match:
                 topic = match.group(1).strip()
                 topic = topic.rstrip("?").strip()
@@ -187,14 +236,7 @@ class MemoryHandler:
 
     def _is_memory_status_query(self, input_lower: str) -> bool:
         """Check if user is asking about memory status."""
-        status_patterns = [
-            r"qu[eé]\s+recuerdas",
-            r"qu[eé]\s+sabes\s+(?:de|sobre)\s+m[ií]",
-            r"cu[aá]nto\s+recuerdas",
-            r"lista\s+(?:de\s+)?recuerdos",
-            r"muestra\s+(?:tus\s+)?recuerdos",
-        ]
-        return any(re.search(p, input_lower) for p in status_patterns)
+        return self._STATUS_RE.search(input_lower) is not None
 
     def _get_memory_status(self) -> str:
         """Get a status report of stored memories."""
@@ -222,18 +264,13 @@ class MemoryHandler:
 
     def _detect_category(self, content: str) -> str:
         """Detect category from content keywords."""
-        content_lower = content.lower()
-
-        categories = {
-            "personal": ["nombre", "cumpleaños", "familia", "esposa", "hijo", "hija"],
-            "trabajo": ["cliente", "proyecto", "reunión", "trabajo", "empresa", "jefe"],
-            "preferencias": ["me gusta", "prefiero", "favorito", "odio", "no me gusta"],
-            "contactos": ["teléfono", "email", "correo", "dirección", "número"],
-            "fechas": ["fecha", "aniversario", "día", "cumple"],
+        matched = {
+            self._KEYWORD_CATEGORY[m.group(1)]
+            for m in self._CATEGORY_RE.finditer(content.lower())
         }
 
-        for category, keywords in categories.items():
-            if any(kw in content_lower for kw in keywords):
+        for category in self.CATEGORY_KEYWORDS:
+            if category in matched:
                 return category
 
         return "general"
@@ -249,7 +286,7 @@ class MemoryHandler:
         }
 
         # Extract words
-        words = re.findall(r'\b\w{3,}\b', content.lower())
+        words = self._KEYWORD_RE.findall(content.lower())
 
         # Filter and return unique keywords
         keywords = [w for w in words if w not in stopwords]
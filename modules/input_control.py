@@ -405,6 +405,16 @@ class InputQueryHandler:
         r"^d[ée]jalo$",
     ]
 
+    # Patterns compiled once at class creation instead of on every query
+    _MOUSE_MOVE_RE = [(re.compile(p), t) for p, t in MOUSE_MOVE_PATTERNS]
+    _CLICK_RE = [(re.compile(p), t) for p, t in CLICK_PATTERNS]
+    _SCROLL_RE = [(re.compile(p), t) for p, t in SCROLL_PATTERNS]
+    _TYPE_RE = [(re.compile(p), re.compile(p, re.IGNORECASE)) for p, _ in TYPE_PATTERNS]
+    _KEY_RE = [re.compile(p) for p, _ in KEY_PATTERNS]
+    _CONFIRM_RE = [re.compile(p) for p in CONFIRM_PATTERNS]
+    _CANCEL_RE = [re.compile(p) for p in CANCEL_PATTERNS]
+    _WHITESPACE_RE = re.compile(r'\s+')
+
     def __init__(self, controller: Optional[SafeInputController] = None):
         self.controller = controller or SafeInputController()
         self.awaiting_confirmation = False
@@ -440,15 +450,15 @@ class InputQueryHandler:
     def _handle_confirmation(self, input_lower: str) -> Tuple[bool, str]:
         """Handle confirmation or cancellation."""
         # Check for confirmation
-        for pattern in self.CONFIRM_PATTERNS:
-            if re.match(pattern, input_lower):
+        for pattern in self._CONFIRM_RE:
+            if pattern.match(input_lower):
                 self.awaiting_confirmation = False
                 result = self.controller.confirm_and_execute()
                 return (True, result.message)
 
         # Check for cancellation
-        for pattern in self.CANCEL_PATTERNS:
-            if re.match(pattern, input_lower):
+        for pattern in self._CANCEL_RE:
+            if pattern.match(input_lower):
                 self.awaiting_confirmation = False
                 msg = self.controller.cancel_pending()
                 return (True, msg)
@@ -459,8 +469,8 @@ class InputQueryHandler:
     def _parse_input_command(self, input_lower: str, original: str) -> Optional[InputAction]:
         """Parse input command and return action."""
         # Mouse move
-        for pattern, cmd_type in self.MOUSE_MOVE_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern, cmd_type in self._MOUSE_MOVE_RE:
+            match = pattern.search(input_lower)
             if match:
                 region = match.group(1).strip()
                 return InputAction(
@@ -470,8 +480,8 @@ class InputQueryHandler:
                 )
 
         # Clicks
-        for pattern, cmd_type in self.CLICK_PATTERNS:
-            if re.search(pattern, input_lower):
+        for pattern, cmd_type in self._CLICK_RE:
+            if pattern.search(input_lower):
                 if cmd_type == "right_click":
                     return InputAction(
                         action_type=ActionType.MOUSE_CLICK,
@@ -492,8 +502,8 @@ class InputQueryHandler:
                     )
 
         # Scroll
-        for pattern, cmd_type in self.SCROLL_PATTERNS:
-            if re.search(pattern, input_lower):
+        for pattern, cmd_type in self._SCROLL_RE:
+            if pattern.search(input_lower):
                 direction = "arriba" if "up" in cmd_type or "arriba" in cmd_type else "abajo"
                 amount = 5 if "page" in cmd_type else 3
                 return InputAction(
@@ -503,11 +513,11 @@ class InputQueryHandler:
                 )
 
         # Typing
-        for pattern, cmd_type in self.TYPE_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern, pattern_nocase in self._TYPE_RE:
+            match = pattern.search(input_lower)
             if match:
                 # Use original to preserve case
-                text_match = re.search(pattern.replace("(.+)", "(.+)"), original, re.IGNORECASE)
+                text_match = pattern_nocase.search(original)
                 text = text_match.group(1).strip() if text_match else match.group(1).strip()
                 return InputAction(
                     action_type=ActionType.KEY_TYPE,
@@ -516,12 +526,12 @@ class InputQueryHandler:
                 )
 
         # Key combos
-        for pattern, cmd_type in self.KEY_PATTERNS:
-            match = re.search(pattern, input_lower)
+        for pattern in self._KEY_RE:
+            match = pattern.search(input_lower)
             if match:
                 keys_str = match.group(1).strip()
                 # Parse keys (e.g., "control alt t" -> ["control", "alt", "t"])
-                keys = re.split(r'\s+', keys_str)
+                keys = self._WHITESPACE_RE.split(keys_str)
                 desc = " + ".join(keys)
                 return InputAction(
                     action_type=ActionType.KEY_COMBO,
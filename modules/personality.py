@@ -3,13 +3,17 @@ JARVIS Personality Module
 Manages JARVIS personality, system prompts, and contextual responses.
 """
 
+import functools
 import random
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Clock indirection so tests can pin the time of day
+_now = datetime.now
+
 
 # System prompt that defines JARVIS personality
 JARVIS_SYSTEM_PROMPT = """Eres JARVIS (Just A Rather Very Intelligent System), el asistente de inteligencia artificial personal. Tu personalidad está inspirada en el JARVIS de Iron Man, pero adaptada para un contexto real.
@@ -74,9 +78,85 @@ Cuando no puedas hacer algo:
 - No repitas "señor" más de una vez por respuesta"""
 
 
+@functools.lru_cache(maxsize=32)
+def _build_system_prompt(user_name: Optional[str], time_context: str) -> str:
+    """Assemble the system prompt; cached since it only varies by these inputs."""
+    parts = [JARVIS_SYSTEM_PROMPT]
+
+    # Add user-specific context if available
+    if user_name:
+        parts.append(f"## Contexto del Usuario\nEl nombre del usuario es {user_name}.")
+
+    parts.append(f"## Contexto Temporal\n{time_context}")
+
+    return "\n\n".join(parts)
+
+
 class JarvisPersonality:
     """Manages JARVIS personality and contextual responses."""
 
+    __slots__ = ("user_name", "formality_level", "conversation_count")
+
+    # Greetings by time of day (phrase tables are shared by all instances)
+    _morning_greetings = (
+        "Buenos días{name}. ¿En qué puedo asistirle?",
+        "Buenos días{name}. A su servicio.",
+        "Buenos días{name}. Espero que haya descansado bien.",
+    )
+
+    _afternoon_greetings = (
+        "Buenas tardes{name}. ¿En qué puedo ayudarle?",
+        "Buenas tardes{name}. A su disposición.",
+        "Buenas tardes{name}. ¿Qué necesita?",
+    )
+
+    _evening_greetings = (
+        "Buenas noches{name}. ¿En qué puedo servirle?",
+        "Buenas noches{name}. A su servicio.",
+        "Buenas noches{name}. ¿Puedo asistirle en algo?",
+    )
+
+    # Wake word responses
+    _wake_responses = (
+        "A sus órdenes{name}.",
+        "Dígame{name}.",
+        "Le escucho{name}.",
+        "¿En qué puedo ayudarle{name}?",
+        "A su servicio{name}.",
+    )
+
+    # Confirmation phrases
+    _confirmations = (
+        "Entendido.",
+        "Muy bien.",
+        "Ciertamente.",
+        "Por supuesto.",
+        "De acuerdo.",
+    )
+
+    # Processing phrases
+    _processing = (
+        "Permítame verificar...",
+        "Un momento...",
+        "Consultando...",
+        "Procesando su solicitud...",
+    )
+
+    # Error/limitation phrases
+    _limitations = (
+        "Me temo que no puedo realizar esa acción.",
+        "Lamentablemente, eso excede mis capacidades actuales.",
+        "Debo confesar que no tengo acceso a esa información.",
+    )
+
+    # Farewell phrases
+    _farewells = (
+        "Hasta pronto{name}.",
+        "Que tenga un excelente día{name}.",
+        "A su servicio cuando me necesite{name}.",
+        "Hasta luego{name}.",
+    )
+
     def __init__(
         self,
         user_name: Optional[str] = None,
@@ -86,66 +166,6 @@ class JarvisPersonality:
         self.formality_level = formality_level
         self.conversation_count = 0
 
-        # Greetings by time of day
-        self._morning_greetings = [
-            "Buenos días{name}. ¿En qué puedo asistirle?",
-            "Buenos días{name}. A su servicio.",
-            "Buenos días{name}. Espero que haya descansado bien.",
-        ]
-
-        self._afternoon_greetings = [
-            "Buenas tardes{name}. ¿En qué puedo ayudarle?",
-            "Buenas tardes{name}. A su disposición.",
-            "Buenas tardes{name}. ¿Qué necesita?",
-        ]
-
-        self._evening_greetings = [
-            "Buenas noches{name}. ¿En qué puedo servirle?",
-            "Buenas noches{name}. A su servicio.",
-            "Buenas noches{name}. ¿Puedo asistirle en algo?",
-        ]
-
-        # Wake word responses
-        self._wake_responses = [
-            "A sus órdenes{name}.",
-            "Dígame{name}.",
-            "Le escucho{name}.",
-            "¿En qué puedo ayudarle{name}?",
-            "A su servicio{name}.",
-        ]
-
-        # Confirmation phrases
-        self._confirmations = [
-            "Entendido.",
-            "Muy bien.",
-            "Ciertamente.",
-            "Por supuesto.",
-            "De acuerdo.",
-        ]
-
-        # Processing phrases
-        self._processing = [
-            "Permítame verificar...",
-            "Un momento...",
-            "Consultando...",
-            "Procesando su solicitud...",
-        ]
-
-        # Error/limitation phrases
-        self._limitations = [
-            "Me temo que no puedo realizar esa acción.",
-            "Lamentablemente, eso excede mis capacidades actuales.",
-            "Debo confesar que no tengo acceso a esa información.",
-        ]
-
-        # Farewell phrases
-        self._farewells = [
-            "Hasta pronto{name}.",
-            "Que tenga un excelente día{name}.",
-            "A su servicio cuando me necesite{name}.",
-            "Hasta luego{name}.",
-        ]
-
         logger.info("Personality module initialized")
 
     def _format_name(self, include_title: bool = True) -> str:
@@ -160,14 +180,7 @@ class JarvisPersonality:
 
     def get_system_prompt(self) -> str:
         """Get the full system prompt for Claude."""
-        prompt = JARVIS_SYSTEM_PROMPT
-
-        # Add user-specific context if available
-        if self.user_name:
-            prompt += f"\n\n## Contexto del Usuario\nEl nombre del usuario es {self.user_name}."
-
-        # Add time context
-        hour = datetime.now().hour
+        hour = _now().hour
         if 5 <= hour < 12:
             time_context = "Es por la mañana."
         elif 12 <= hour < 19:
@@ -175,13 +188,11 @@ class JarvisPersonality:
         else:
             time_context = "Es de noche."
 
-        prompt += f"\n\n## Contexto Temporal\n{time_context}"
-
-        return prompt
+        return _build_system_prompt(self.user_name, time_context)
 
     def get_greeting(self) -> str:
         """Get appropriate greeting based on time of day."""
-        hour = datetime.now().hour
+        hour = _now().hour
         name = self._format_name(include_title=True)
 
         if 5 <= hour < 12:
@@ -195,9 +206,15 @@ class JarvisPersonality:
 
     def get_wake_response(self) -> str:
         """Get response after wake word detection."""
+        return self.get_wake_responses(1)[0]
+
+    def get_wake_responses(self, k: int) -> List[str]:
+        """Get k wake responses drawn in a single sampling call."""
         name = self._format_name(include_title=False)
-        response = random.choice(self._wake_responses)
-        return response.format(name=name)
+        return [
+            response.format(name=name)
+            for response in random.choices(self._wake_responses, k=k)
+        ]
 
     def get_confirmation(self) -> str:
         """Get a confirmation phrase."""
@@ -219,7 +236,7 @@ class JarvisPersonality:
 
     def get_startup_message(self) -> str:
         """Get startup message."""
-        hour = datetime.now().hour
+        hour = _now().hour
         name = self._format_name(include_title=True)
 
         if 5 <= hour < 12:
@@ -10,13 +10,22 @@ import re
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Callable, Tuple
+from typing import Optional, List, Dict, Callable, Iterable, Tuple
 from dataclasses import dataclass, field, asdict
 import sqlite3
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Clock indirection so tests can move time forward without sleeping
+_now = datetime.now
+
+SQL_ADD_REMINDER = """
+    INSERT INTO reminders
+    (message, trigger_time, created_at, triggered, recurring, recurrence_minutes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class Reminder:
@@ -55,20 +64,60 @@ class ReminderDatabase:
     def __init__(self, db_path: str = "memory/reminders.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared with the reminder check thread; this also
+        # lets ":memory:" databases live as long as the instance
+        self._lock = threading.RLock()
+        self._in_batch = False
+        self._fts_enabled = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
         self._init_database()
 
     @contextmanager
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        with self._lock:
+            conn = self._conn
+            if self._in_batch:
+                # The enclosing batch() owns commit/rollback
+                yield conn
+                return
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Refresh planner statistics and close the connection."""
+        with self._lock:
+            # Closing twice is a no-op
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("PRAGMA optimize")
+            finally:
+                self._conn.close()
+                self._conn = None
+        logger.info(f"Reminder database closed: {self.db_path}")
+
+    @contextmanager
+    def batch(self):
+        """Run several operations inside a single transaction."""
+        with self._lock:
+            if self._in_batch:
+                yield self
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_batch = True
+            try:
+                yield self
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            finally:
+                self._in_batch = False
 
     def _init_database(self):
         with self._get_connection() as conn:
@@ -77,16 +126,21 @@ class ReminderDatabase:
                 CREATE TABLE IF NOT EXISTS reminders (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     message TEXT NOT NULL,
-                    trigger_time TIMESTAMP NOT NULL,
+                    trigger_time INTEGER NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     triggered BOOLEAN DEFAULT FALSE,
                     recurring BOOLEAN DEFAULT FALSE,
                     recurrence_minutes INTEGER DEFAULT 0
                 )
             """)
+            self._migrate_trigger_times(cursor)
+
+            # Pending/due lookups filter on triggered and order by
+            # trigger_time, so one composite index serves both as a seek.
+            cursor.execute("DROP INDEX IF EXISTS idx_trigger_time")
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trigger_time
-                ON reminders(trigger_time)
+                CREATE INDEX IF NOT EXISTS idx_reminders_triggered_time
+                ON reminders(triggered, trigger_time)
             """)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS voice_notes (
@@ -97,23 +151,97 @@ class ReminderDatabase:
                 )
             """)
 
+            self._fts_enabled = self._init_fts(cursor)
+
+    def _migrate_trigger_times(self, cursor) -> None:
+        """Convert ISO text trigger times from older databases to epoch seconds."""
+        cursor.execute(
+            "SELECT id, trigger_time FROM reminders WHERE typeof(trigger_time) = 'text'"
+        )
+        rows = [
+            (int(datetime.fromisoformat(row["trigger_time"]).timestamp()), row["id"])
+            for row in cursor.fetchall()
+        ]
+        if rows:
+            cursor.executemany(
+                "UPDATE reminders SET trigger_time = ? WHERE id = ?", rows
+            )
+            logger.info(f"Migrated {len(rows)} reminder trigger times to epoch seconds")
+
+    def _init_fts(self, cursor) -> bool:
+        """Create the FTS5 index over voice notes; False if FTS5 is unavailable."""
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'voice_notes_fts'"
+            )
+            exists = cursor.fetchone() is not None
+
+            # Trigram tokenizer keeps the substring semantics of LIKE '%q%'
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS voice_notes_fts USING fts5(
+                    content, tags,
+                    content='voice_notes', content_rowid='id',
+                    tokenize='trigram'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS voice_notes_fts_insert
+                AFTER INSERT ON voice_notes BEGIN
+                    INSERT INTO voice_notes_fts(rowid, content, tags)
+                    VALUES (new.id, new.content, new.tags);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS voice_notes_fts_delete
+                AFTER DELETE ON voice_notes BEGIN
+                    INSERT INTO voice_notes_fts(voice_notes_fts, rowid, content, tags)
+                    VALUES ('delete', old.id, old.content, old.tags);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS voice_notes_fts_update
+                AFTER UPDATE OF content, tags ON voice_notes BEGIN
+                    INSERT INTO voice_notes_fts(voice_notes_fts, rowid, content, tags)
+                    VALUES ('delete', old.id, old.content, old.tags);
+                    INSERT INTO voice_notes_fts(rowid, content, tags)
+                    VALUES (new.id, new.content, new.tags);
+                END
+            """)
+
+            # Index notes stored before the FTS table existed
+            if not exists:
+                cursor.execute(
+                    "INSERT INTO voice_notes_fts(voice_notes_fts) VALUES ('rebuild')"
+                )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, using LIKE search: {e}")
+            return False
+
+    @staticmethod
+    def _reminder_params(reminder: Reminder) -> tuple:
+        return (
+            reminder.message,
+            int(reminder.trigger_time.timestamp()),
+            reminder.created_at.isoformat(),
+            reminder.triggered,
+            reminder.recurring,
+            reminder.recurrence_minutes
+        )
+
     def add_reminder(self, reminder: Reminder) -> int:
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO reminders
-                (message, trigger_time, created_at, triggered, recurring, recurrence_minutes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                reminder.message,
-                reminder.trigger_time.isoformat(),
-                reminder.created_at.isoformat(),
-                reminder.triggered,
-                reminder.recurring,
-                reminder.recurrence_minutes
-            ))
+            cursor.execute(SQL_ADD_REMINDER, self._reminder_params(reminder))
             return cursor.lastrowid
 
+    def add_reminders(self, reminders: Iterable[Reminder]) -> int:
+        """Add several reminders in one statement and transaction."""
+        rows = [self._reminder_params(reminder) for reminder in reminders]
+        with self._get_connection() as conn:
+            conn.executemany(SQL_ADD_REMINDER, rows)
+        return len(rows)
+
     def get_pending_reminders(self) -> List[Reminder]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -125,7 +253,7 @@ class ReminderDatabase:
             return [self._row_to_reminder(row) for row in cursor.fetchall()]
 
     def get_due_reminders(self) -> List[Reminder]:
-        now = datetime.now().isoformat()
+        now = int(_now().timestamp())
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -146,7 +274,7 @@ class ReminderDatabase:
         if not reminder.recurring or reminder.recurrence_minutes <= 0:
             return None
 
-        new_trigger = datetime.now() + timedelta(minutes=reminder.recurrence_minutes)
+        new_trigger = _now() + timedelta(minutes=reminder.recurrence_minutes)
         new_reminder = Reminder(
             id=None,
             message=reminder.message,
@@ -163,7 +291,7 @@ class ReminderDatabase:
             return cursor.rowcount > 0
 
     def clear_old_reminders(self, days: int = 7) -> int:
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff = int((_now() - timedelta(days=days)).timestamp())
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -175,7 +303,7 @@ class ReminderDatabase:
         return Reminder(
             id=row["id"],
             message=row["message"],
-            trigger_time=datetime.fromisoformat(row["trigger_time"]),
+            trigger_time=datetime.fromtimestamp(row["trigger_time"]),
             created_at=datetime.fromisoformat(row["created_at"]),
             triggered=bool(row["triggered"]),
             recurring=bool(row["recurring"]),
@@ -209,13 +337,21 @@ class ReminderDatabase:
             } for row in cursor.fetchall()]
 
     def search_voice_notes(self, query: str) -> List[Dict]:
+        # Trigram MATCH needs at least 3 characters; shorter terms use LIKE
+        if self._fts_enabled and len(query) >= 3:
+            condition = "id IN (SELECT rowid FROM voice_notes_fts WHERE voice_notes_fts MATCH ?)"
+            params = ['"' + query.replace('"', '""') + '"']
+        else:
+            condition = "(content LIKE ? OR tags LIKE ?)"
+            params = [f"%{query}%", f"%{query}%"]
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT * FROM voice_notes
-                WHERE content LIKE ? OR tags LIKE ?
+                WHERE {condition}
                 ORDER BY created_at DESC
-            """, (f"%{query}%", f"%{query}%"))
+            """, params)
             return [{
                 "id": row["id"],
                 "content": row["content"],
@@ -260,9 +396,10 @@ class ReminderManager:
         db_path: str = "memory/reminders.db",
         on_reminder: Optional[Callable[[str], None]] = None,
         check_interval: float = 30.0,
-        work_break_interval: int = 60
+        work_break_interval: int = 60,
+        db: Optional[ReminderDatabase] = None
     ):
-        self.db = ReminderDatabase(db_path)
+        self.db = db or ReminderDatabase(db_path)
         self.on_reminder = on_reminder
         self.check_interval = check_interval
         self.work_break_interval = work_break_interval
@@ -280,7 +417,7 @@ class ReminderManager:
 
         self._running = True
         self._work_session = WorkSession(
-            started_at=datetime.now(),
+            started_at=_now(),
             break_interval_minutes=self.work_break_interval
         )
         self._check_thread = threading.Thread(
@@ -332,7 +469,7 @@ class ReminderManager:
         if not self._work_session:
             return
 
-        now = datetime.now()
+        now = _now()
         session_duration = (now - self._work_session.started_at).total_seconds() / 60
 
         # Check if break reminder is due
@@ -360,7 +497,7 @@ class ReminderManager:
     def reset_work_session(self) -> None:
         """Reset the work session timer."""
         self._work_session = WorkSession(
-            started_at=datetime.now(),
+            started_at=_now(),
             break_interval_minutes=self.work_break_interval
         )
         logger.info("Work session reset")
@@ -369,7 +506,7 @@ class ReminderManager:
         """Get current work session duration."""
         if not self._work_session:
             return None
-        return datetime.now() - self._work_session.started_at
+        return _now() - self._work_session.started_at
 
     # ==================== Reminder Creation ====================
 
@@ -398,7 +535,7 @@ class ReminderManager:
 
         if not trigger_time:
             # Default to 30 minutes
-            trigger_time = datetime.now() + timedelta(minutes=30)
+            trigger_time = _now() + timedelta(minutes=30)
             time_desc = "en 30 minutos"
         else:
             time_desc = self._format_time(trigger_time)
@@ -428,35 +565,35 @@ class ReminderManager:
             if match:
                 if time_type == "minutes":
                     minutes = int(match.group(1))
-                    return datetime.now() + timedelta(minutes=minutes)
+                    return _now() + timedelta(minutes=minutes)
 
                 elif time_type == "hours":
                     hours = int(match.group(1))
-                    return datetime.now() + timedelta(hours=hours)
+                    return _now() + timedelta(hours=hours)
 
                 elif time_type == "30min":
-                    return datetime.now() + timedelta(minutes=30)
+                    return _now() + timedelta(minutes=30)
 
                 elif time_type == "1hour":
-                    return datetime.now() + timedelta(hours=1)
+                    return _now() + timedelta(hours=1)
 
                 elif time_type == "15min":
-                    return datetime.now() + timedelta(minutes=15)
+                    return _now() + timedelta(minutes=15)
 
                 elif time_type == "at_time":
                     hour = int(match.group(1))
                     minute = int(match.group(2)) if match.group(2) else 0
-                    target = datetime.now().replace(
+                    target = _now().replace(
                         hour=hour, minute=minute, second=0, microsecond=0
                     )
-                    if target <= datetime.now():
+                    if target <= _now():
                         target += timedelta(days=1)
                     return target
 
                 elif time_type == "tomorrow_at":
                     hour = int(match.group(1))
                     minute = int(match.group(2)) if match.group(2) else 0
-                    target = datetime.now().replace(
+                    target = _now().replace(
                         hour=hour, minute=minute, second=0, microsecond=0
                     )
                     target += timedelta(days=1)
@@ -484,7 +621,7 @@ class ReminderManager:
 
     def _format_time(self, dt: datetime) -> str:
         """Format datetime for speech."""
-        now = datetime.now()
+        now = _now()
         diff = dt - now
 
         if diff.total_seconds() < 3600:
@@ -116,6 +116,9 @@ class SystemControl:
         r":(){.*};:",
     ]
 
+    _DANGEROUS_RE = [re.compile(p, re.IGNORECASE) for p in DANGEROUS_PATTERNS]
+    _FORBIDDEN_RE = [re.compile(p, re.IGNORECASE) for p in FORBIDDEN_PATTERNS]
+
     def __init__(
         self,
         log_file: str = "logs/actions.log",
@@ -166,13 +169,13 @@ class SystemControl:
     def _assess_risk(self, command: str) -> ActionRisk:
         """Assess the risk level of a command."""
         # Check forbidden patterns first
-        for pattern in self.FORBIDDEN_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
+        for pattern in self._FORBIDDEN_RE:
+            if pattern.search(command):
                 return ActionRisk.FORBIDDEN
 
         # Check dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
+        for pattern in self._DANGEROUS_RE:
+            if pattern.search(command):
                 return ActionRisk.DANGEROUS
 
         return ActionRisk.SAFE
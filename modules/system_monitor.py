@@ -6,7 +6,6 @@ Provides proactive alerts when thresholds are exceeded.
 
 import logging
 import threading
-import time
 import socket
 import re
 from datetime import datetime, timedelta
@@ -75,6 +74,8 @@ class SystemMonitor:
 
         self._running = False
         self._monitor_thread: Optional[threading.Thread] = None
+        # Set to wake the loop immediately on stop instead of finishing its sleep
+        self._stop_event = threading.Event()
         self._cpu_history: List[tuple] = []  # (timestamp, cpu_percent)
         self._last_alert_time: Dict[str, datetime] = {}
         self._alert_cooldown = timedelta(minutes=5)
@@ -87,6 +88,7 @@ class SystemMonitor:
             return
 
         self._running = True
+        self._stop_event.clear()
         self._monitor_thread = threading.Thread(
             target=self._monitor_loop,
             daemon=True
@@ -97,6 +99,7 @@ class SystemMonitor:
     def stop_monitoring(self) -> None:
         """Stop background monitoring."""
         self._running = False
+        self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
         logger.info("Background monitoring stopped")
@@ -106,7 +109,7 @@ class SystemMonitor:
         while self._running:
             try:
                 self._check_for_alerts()
-                time.sleep(self.check_interval)
+                self._stop_event.wait(self.check_interval)
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
 
@@ -468,6 +471,8 @@ class SystemQueryHandler:
         (r"qu[eé]\s+est[aá]\s+consumiendo", "processes"),
     ]
 
+    _SYSTEM_RE = [(re.compile(p), t) for p, t in SYSTEM_PATTERNS]
+
     def __init__(self, monitor: Optional[SystemMonitor] = None):
         self.monitor = monitor or SystemMonitor()
 
@@ -480,8 +485,8 @@ class SystemQueryHandler:
         """
         input_lower = user_input.lower().strip()
 
-        for pattern, query_type in self.SYSTEM_PATTERNS:
-            if re.search(pattern, input_lower):
+        for pattern, query_type in self._SYSTEM_RE:
+            if pattern.search(input_lower):
                 response = self._handle_query(query_type)
                 return (True, response)
 
@@ -401,6 +401,11 @@ class VisualAutomationHandler:
     CONFIRM_PATTERNS = [r"^s[ií]$", r"^procede$", r"^adelante$", r"^confirmo$"]
     CANCEL_PATTERNS = [r"^no$", r"^cancela$", r"^para$"]
 
+    # Each list folded into one alternation so a query is scanned once per list
+    _AUTOMATION_RE = re.compile("|".join(f"(?:{p})" for p, _ in AUTOMATION_PATTERNS))
+    _CONFIRM_RE = re.compile("|".join(f"(?:{p})" for p in CONFIRM_PATTERNS))
+    _CANCEL_RE = re.compile("|".join(f"(?:{p})" for p in CANCEL_PATTERNS))
+
     def __init__(self, automation: Optional[VisualAutomation] = None):
         self.automation = automation or VisualAutomation()
         self.awaiting_confirmation = False
@@ -410,30 +415,27 @@ class VisualAutomationHandler:
         input_lower = user_input.lower().strip()
 
         # Check for cancel
-        for pattern in self.CANCEL_PATTERNS:
-            if re.match(pattern, input_lower):
-                if self.awaiting_confirmation:
-                    self.awaiting_confirmation = False
-                    self.automation.reset()
-                    return (True, "Tarea cancelada.")
-                return (False, None)
+        if self._CANCEL_RE.match(input_lower):
+            if self.awaiting_confirmation:
+                self.awaiting_confirmation = False
+                self.automation.reset()
+                return (True, "Tarea cancelada.")
+            return (False, None)
 
         # Check for confirmation
         if self.awaiting_confirmation:
-            for pattern in self.CONFIRM_PATTERNS:
-                if re.match(pattern, input_lower):
-                    self.awaiting_confirmation = False
-                    result = self.automation.confirm_and_execute()
-                    return (True, result)
+            if self._CONFIRM_RE.match(input_lower):
+                self.awaiting_confirmation = False
+                result = self.automation.confirm_and_execute()
+                return (True, result)
             return (True, "Diga 'sí' para confirmar o 'no' para cancelar el plan.")
 
         # Check for new automation task
-        for pattern, _ in self.AUTOMATION_PATTERNS:
-            if re.search(pattern, input_lower):
-                task = self.automation.plan_task(user_input)
-                summary = self.automation.get_plan_summary()
-                self.awaiting_confirmation = True
-                return (True, f"{summary}\n¿Procedo con este plan, señor?")
+        if self._AUTOMATION_RE.search(input_lower):
+            task = self.automation.plan_task(user_input)
+            summary = self.automation.get_plan_summary()
+            self.awaiting_confirmation = True
+            return (True, f"{summary}\n¿Procedo con este plan, señor?")
 
         return (False, None)
 
@@ -4,15 +4,25 @@ Uses OpenWakeWord for local, offline wake word detection
 """
 
 import threading
-import queue
+import time
 import logging
-from typing import Callable, Optional
+from collections import deque
+from typing import Callable, Deque, Optional
 
 import numpy as np
 import sounddevice as sd
 
 logger = logging.getLogger(__name__)
 
+# OpenWakeWord needs 1280 samples (80ms at 16kHz) per prediction
+CHUNK_SAMPLES = 1280
+# ~5 s of 80 ms chunks; if prediction falls behind the oldest audio is dropped
+AUDIO_QUEUE_CHUNKS = 64
+# Queued chunks plus the one the consumer holds while predicting
+AUDIO_RING_SLOTS = AUDIO_QUEUE_CHUNKS + 1
+# Consumer back-off when no chunk is ready (one chunk is 80 ms)
+QUEUE_POLL_INTERVAL = 0.01
+
 try:
     from openwakeword.model import Model as OWWModel
     OPENWAKEWORD_AVAILABLE = True
@@ -35,7 +45,9 @@ class WakeWordDetector:
         self.sample_rate = sample_rate
         self.is_listening = False
         self._stop_requested = False
-        self.audio_queue: queue.Queue = queue.Queue()
+        # Preallocated int16 chunks the callback converts into
+        self._ring = np.empty((AUDIO_RING_SLOTS, CHUNK_SAMPLES), dtype=np.int16)
+        self._reset_buffers()
 
         if not OPENWAKEWORD_AVAILABLE:
             raise RuntimeError(
@@ -62,13 +74,32 @@ class WakeWordDetector:
 
         logger.info("Wake word detector initialized")
 
-    def _audio_callback(self, indata, frames, time, status):
+    def _reset_buffers(self):
+        """Return every ring slot to the free list and empty the queue."""
+        # Each slot is either free, queued, or held by the consumer; a slot
+        # only goes back to the free list once predict() is done with it.
+        # append/popleft are atomic, so the audio thread never takes a lock
+        self.audio_queue: Deque[np.ndarray] = deque()
+        self._free_slots: Deque[np.ndarray] = deque(self._ring)
+
+    def _audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream."""
         if status:
             logger.warning(f"Audio status: {status}")
-        # OpenWakeWord expects int16
-        audio_int16 = (indata * 32767).astype(np.int16)
-        self.audio_queue.put(audio_int16.flatten())
+        if frames != CHUNK_SAMPLES:
+            logger.warning(f"Unexpected audio block of {frames} frames, dropped")
+            return
+        try:
+            slot = self._free_slots.popleft()
+        except IndexError:
+            # Prediction fell behind: recycle the oldest queued chunk
+            try:
+                slot = self.audio_queue.popleft()
+            except IndexError:
+                return
+        # The stream already delivers int16 PCM, which OpenWakeWord expects
+        np.copyto(slot, indata[:, 0])
+        self.audio_queue.append(slot)
 
     def listen(
         self,
@@ -84,17 +115,14 @@ class WakeWordDetector:
         """
         self.is_listening = True
         self._stop_requested = False
-        self.audio_queue = queue.Queue()
-
-        # OpenWakeWord needs 1280 samples (80ms at 16kHz) per prediction
-        chunk_size = 1280
+        self._reset_buffers()
 
         try:
             with sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=1,
-                dtype='float32',
-                blocksize=chunk_size,
+                dtype='int16',
+                blocksize=CHUNK_SAMPLES,
                 callback=self._audio_callback
             ):
                 logger.info(f"Listening for wake word: '{self.model_name}'")
@@ -104,12 +132,14 @@ class WakeWordDetector:
                         break
 
                     try:
-                        audio_chunk = self.audio_queue.get(timeout=0.1)
-                    except queue.Empty:
+                        audio_chunk = self.audio_queue.popleft()
+                    except IndexError:
+                        time.sleep(QUEUE_POLL_INTERVAL)
                         continue
 
-                    # Run prediction
+                    # Run prediction, then hand the slot back to the callback
                     prediction = self.model.predict(audio_chunk)
+                    self._free_slots.append(audio_chunk)
 
                     # Check if any model triggered
                     for model_name, scores in prediction.items():
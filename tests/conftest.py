@@ -2,6 +2,7 @@
 Pytest configuration and shared fixtures for JARVIS tests.
 """
 
+import importlib
 import os
 import sys
 import pytest
@@ -12,18 +13,60 @@ from unittest.mock import MagicMock, patch
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Pay the heavy import cost once at startup instead of in whichever test runs first
+for _module in ("modules.system_control", "modules.stt", "modules.wake_word",
+                "modules.visual_automation", "sounds", "ui"):
+    try:
+        importlib.import_module(_module)
+    except (ImportError, OSError):
+        # Missing optional audio deps (vosk, PortAudio); the tests report it
+        pass
+
 # Test configuration
 TEST_SAMPLE_RATE = 16000
 TEST_AUDIO_CHUNK = bytes([0] * 1024)
 
 
-@pytest.fixture
+def pytest_addoption(parser):
+    """Add command line options."""
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="run slow tests (real Vosk model)"
+    )
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "serial: touches process-global state; kept on a single xdist worker"
+    )
+    config.addinivalue_line(
+        "markers",
+        "slow: expensive test, skipped unless --runslow is given"
+    )
+
+
+# Must run before xdist's own hook, which bakes the group into each nodeid
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Pin serial tests to one xdist group and skip slow tests without --runslow."""
+    run_slow = config.getoption("--runslow")
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+        if not run_slow and item.get_closest_marker("slow"):
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
 def project_root():
     """Return project root path."""
     return PROJECT_ROOT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def models_dir(project_root):
     """Return models directory path."""
     return project_root / "models"
@@ -0,0 +1,85 @@
+"""
+Tests for the audio device manager.
+"""
+
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+DEVICES = [
+    {'name': 'Mic Array', 'max_input_channels': 4, 'default_samplerate': 48000},
+    {'name': 'Speakers', 'max_input_channels': 0, 'default_samplerate': 48000},
+    {'name': 'Headset', 'max_input_channels': 1, 'default_samplerate': 16000},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the device cache."""
+    from ui import audio_devices
+
+    now = [100.0]
+    monkeypatch.setattr(audio_devices, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def fake_sd(monkeypatch):
+    """Stub sounddevice with a fixed device list."""
+    from ui import audio_devices
+
+    sd = MagicMock()
+    sd.query_devices.return_value = DEVICES
+    sd.default.device = [0, 1]
+    monkeypatch.setattr(audio_devices, 'sd', sd)
+    return sd
+
+
+@pytest.fixture
+def manager(fake_sd, clock):
+    """Device manager over the stubbed device list."""
+    from ui.audio_devices import AudioDeviceManager
+    return AudioDeviceManager()
+
+
+class TestAudioDeviceManager:
+    """Tests for AudioDeviceManager class."""
+
+    def test_input_devices(self, manager):
+        """Test only devices with input channels are listed."""
+        devices = manager.get_input_devices()
+
+        assert [d['index'] for d in devices] == [0, 2]
+        assert devices[0]['is_default']
+
+    def test_repeated_queries_use_cache(self, manager, fake_sd):
+        """Test polling within the TTL does not re-enumerate devices."""
+        manager.format_device_list()
+        manager.get_best_microphone()
+        manager.get_input_devices()
+
+        assert fake_sd.query_devices.call_count == 1
+
+    def test_cache_expires(self, manager, fake_sd, clock):
+        """Test devices are enumerated again once the TTL has passed."""
+        clock[0] += manager._ttl + 1
+        manager.get_input_devices()
+
+        assert fake_sd.query_devices.call_count == 2
+
+    def test_forced_refresh(self, manager, fake_sd):
+        """Test an explicit refresh bypasses the cache."""
+        manager.refresh(force=True)
+
+        assert fake_sd.query_devices.call_count == 2
+
+    def test_best_microphone(self, manager):
+        """Test the array microphone wins over the headset."""
+        assert manager.get_best_microphone() == 0
+
+    def test_device_rms_no_overflow(self, manager, fake_sd):
+        """Test the noise level of a full-scale int16 signal doesn't overflow."""
+        fake_sd.rec.return_value = np.full((8000, 1), -32768, dtype=np.int16)
+
+        assert manager.test_device(0) == pytest.approx(32768.0)
@@ -5,8 +5,6 @@ Prueba Delay-and-Sum beamforming para 2 micrófonos.
 
 import pytest
 import numpy as np
-import sys
-sys.path.insert(0, '/home/andres/Desarrollo/IA/Jarvis')
 
 from ui.beamformer import Beamformer
 
@@ -0,0 +1,22 @@
+"""
+Tests for the JARVIS Screen Vision CaptureResult dataclass.
+"""
+
+from modules.screen_vision import CaptureResult
+
+
+class TestCaptureResult:
+    """Tests for CaptureResult dataclass."""
+
+    def test_capture_result_success(self):
+        """Test successful capture result."""
+        result = CaptureResult(success=True, file_path="/tmp/screen.png")
+        assert result.success
+        assert result.file_path == "/tmp/screen.png"
+        assert result.error is None
+
+    def test_capture_result_failure(self):
+        """Test failed capture result."""
+        result = CaptureResult(success=False, error="No display")
+        assert not result.success
+        assert result.error == "No display"
@@ -401,27 +401,28 @@ class TestInputQueryHandler:
             assert not is_handled, f"Should NOT handle: {query}"
 
 
+@pytest.mark.serial
 class TestSingletons:
     """Tests for singleton functions."""
 
-    def test_get_input_controller(self):
+    def test_get_input_controller(self, monkeypatch):
         """Test get_input_controller returns instance."""
         from modules import input_control
 
-        # Reset singleton
-        input_control._controller_instance = None
+        # Reset singleton (restored by monkeypatch after the test)
+        monkeypatch.setattr(input_control, '_controller_instance', None)
 
         with patch('shutil.which', return_value="/usr/bin/xdotool"):
             controller = input_control.get_input_controller()
             assert controller is not None
 
-    def test_get_input_handler(self):
+    def test_get_input_handler(self, monkeypatch):
         """Test get_input_handler returns instance."""
         from modules import input_control
 
-        # Reset singletons
-        input_control._controller_instance = None
-        input_control._handler_instance = None
+        # Reset singletons (restored by monkeypatch after the test)
+        monkeypatch.setattr(input_control, '_controller_instance', None)
+        monkeypatch.setattr(input_control, '_handler_instance', None)
 
         with patch('shutil.which', return_value="/usr/bin/xdotool"):
             handler = input_control.get_input_handler()
@@ -112,6 +112,8 @@ class TestJarvisOrchestrator:
 
                         assert jarvis.running is False
                         assert jarvis._shutdown_requested is True
+                        # May run from a signal handler: leave the DB to run()
+                        assert jarvis.reminder_manager.db._conn is not None
 
     def test_default_config_structure(self, project_root):
         """Test that default config has correct structure."""
@@ -3,32 +3,52 @@ Tests for JARVIS Memory module.
 """
 
 import pytest
+import sqlite3
 import tempfile
 import os
+import uuid
 from pathlib import Path
 
 
+@pytest.fixture(scope="session")
+def memory_db_template(tmp_path_factory):
+    """Build the memory schema once; tests clone it instead of re-running DDL."""
+    from memory.database import MemoryDatabase
+
+    db_path = tmp_path_factory.mktemp("memory") / "template.db"
+    MemoryDatabase(db_path)
+    return db_path
+
+
+@pytest.fixture
+def cloned_db(memory_db_template):
+    """Fresh in-memory MemoryDatabase copied page-by-page from the template."""
+    from memory.database import MemoryDatabase
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    source = sqlite3.connect(memory_db_template)
+    source.backup(conn)
+    source.close()
+
+    yield MemoryDatabase.from_connection(conn)
+
+    conn.close()
+
+
 class TestMemoryDatabase:
     """Tests for MemoryDatabase class."""
 
     @pytest.fixture
-    def temp_db(self):
+    def temp_db(self, cloned_db):
         """Create a temporary database for testing."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
+        return cloned_db
 
+    def test_initialization_creates_db(self, tmp_path):
+        """Test database file is created."""
         from memory.database import MemoryDatabase
-        db = MemoryDatabase(db_path)
-
-        yield db
 
-        # Cleanup
-        if os.path.exists(db_path):
-            os.unlink(db_path)
-
-    def test_initialization_creates_db(self, temp_db):
-        """Test database file is created."""
-        assert temp_db.db_path.exists()
+        db = MemoryDatabase(tmp_path / "jarvis.db")
+        assert db.db_path.exists()
 
     def test_set_and_get_preference(self, temp_db):
         """Test setting and getting preferences."""
@@ -45,6 +65,37 @@ class TestMemoryDatabase:
         result = temp_db.get_preference("settings")
         assert result == {"volume": 80, "muted": False}
 
+    def test_preference_legacy_json_values(self, temp_db):
+        """Test JSON-encoded values written before msgpack still load."""
+        with temp_db.batch() as db:
+            db._conn.execute(
+                "INSERT INTO preferences (key, value) VALUES (?, ?)",
+                ("settings", '{"volume": 80, "muted": false}')
+            )
+        assert temp_db.get_preference("settings") == {"volume": 80, "muted": False}
+
+    def test_preference_values_without_msgpack(self, temp_db, monkeypatch):
+        """Test preferences fall back to JSON when msgpack is unavailable."""
+        from memory import database
+
+        monkeypatch.setattr(database, "MSGPACK_AVAILABLE", False)
+        temp_db.set_preference("settings", {"volume": 80, "muted": False})
+        assert temp_db.get_preference("settings") == {"volume": 80, "muted": False}
+
+    def test_msgpack_preference_without_msgpack(self, temp_db, monkeypatch):
+        """Test a msgpack value read without msgpack returns the caller's default."""
+        from memory import database
+
+        with temp_db.batch() as db:
+            db._conn.execute(
+                "INSERT INTO preferences (key, value) VALUES (?, ?)",
+                ("settings", b"\x81\xa6volume\x50")
+            )
+        monkeypatch.setattr(database, "MSGPACK_AVAILABLE", False)
+
+        assert temp_db.get_preference("settings", {"volume": 50}) == {"volume": 50}
+        assert "settings" not in temp_db.get_all_preferences()
+
     def test_get_all_preferences(self, temp_db):
         """Test getting all preferences."""
         temp_db.set_preference("key1", "value1")
@@ -77,6 +128,21 @@ class TestMemoryDatabase:
         assert len(results) == 1
         assert "María" in results[0]["content"]
 
+    def test_search_memories_substring(self, temp_db):
+        """Test search matches inside words and short terms."""
+        temp_db.add_memory("Mi proyecto actual es JARVIS", keywords=["asistente"])
+
+        assert len(temp_db.search_memories("proyect")) == 1
+        assert len(temp_db.search_memories("sistent")) == 1
+        assert len(temp_db.search_memories("es")) == 1
+        assert temp_db.search_memories("inexistente") == []
+
+    def test_search_after_delete(self, temp_db):
+        """Test deleted memories are no longer found."""
+        memory_id = temp_db.add_memory("Reunión con RSM")
+        assert temp_db.delete_memory(memory_id)
+        assert temp_db.search_memories("Reunión") == []
+
     def test_search_memories_by_category(self, temp_db):
         """Test searching memories by category."""
         temp_db.add_memory("Info personal", category="personal")
@@ -98,6 +164,34 @@ class TestMemoryDatabase:
         results = temp_db.search_memories("RSM")
         assert len(results) == 0
 
+    def test_add_memories_batch(self, temp_db):
+        """Test adding several memories at once."""
+        count = temp_db.add_memories([
+            ("Mi cliente es RSM", "trabajo", ["cliente"]),
+            ("Me gusta el café", "preferencias", None),
+        ])
+        assert count == 2
+        assert len(temp_db.search_memories(category="trabajo")) == 1
+        assert len(temp_db.get_all_memories()) == 2
+
+    def test_batch_commits_together(self, temp_db):
+        """Test writes inside batch() are committed as one transaction."""
+        with temp_db.batch():
+            temp_db.add_memory("Primera")
+            temp_db.set_preference("key", "value")
+
+        assert len(temp_db.get_all_memories()) == 1
+        assert temp_db.get_preference("key") == "value"
+
+    def test_batch_rolls_back_on_error(self, temp_db):
+        """Test a failing batch leaves no partial writes."""
+        with pytest.raises(RuntimeError):
+            with temp_db.batch():
+                temp_db.add_memory("Descartada")
+                raise RuntimeError("boom")
+
+        assert temp_db.get_all_memories() == []
+
     def test_session_management(self, temp_db):
         """Test session creation and ending."""
         session_id = temp_db.start_session()
@@ -120,6 +214,39 @@ class TestMemoryDatabase:
         assert history[0]["role"] == "user"
         assert history[1]["role"] == "assistant"
 
+    def test_conversation_history_uses_index(self, temp_db):
+        """Test history lookup searches the composite index without sorting."""
+        plan = temp_db._conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT role, content, timestamp FROM conversations
+            WHERE session_id = ? ORDER BY timestamp DESC LIMIT ?
+        """, ("s", 20)).fetchall()
+        details = " ".join(row["detail"] for row in plan)
+
+        assert "USING INDEX idx_conversations_session_time" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_category_search_uses_index(self, temp_db):
+        """Test category filtering searches the category index."""
+        plan = temp_db._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM memories WHERE category = ?",
+            ("trabajo",)
+        ).fetchall()
+
+        assert "idx_memories_category" in " ".join(row["detail"] for row in plan)
+
+    def test_add_conversations_batch(self, temp_db):
+        """Test adding several messages at once updates the session count."""
+        session_id = temp_db.start_session()
+
+        temp_db.add_conversations(session_id, [
+            ("user", "Hola JARVIS"),
+            ("assistant", "Buenos días, señor"),
+        ])
+
+        assert len(temp_db.get_conversation_history(session_id)) == 2
+        assert temp_db.get_recent_sessions()[0]["message_count"] == 2
+
     def test_user_name_storage(self, temp_db):
         """Test user name storage and retrieval."""
         assert temp_db.get_user_name() is None
@@ -148,6 +275,18 @@ class TestMemoryDatabase:
         assert "memories" in export
         assert "exported_at" in export
 
+    def test_export_memories_contents(self, temp_db):
+        """Test export returns stored rows without counting them as accessed."""
+        temp_db.add_memory("Mi cliente es RSM", keywords=["cliente", "RSM"])
+        temp_db.set_preference("settings", {"volume": 80})
+
+        export = temp_db.export_memories()
+        memory = export["memories"][0]
+        assert memory["content"] == "Mi cliente es RSM"
+        assert memory["keywords"] == ["cliente", "RSM"]
+        assert memory["access_count"] == 0
+        assert export["preferences"]["settings"] == {"volume": 80}
+
     def test_clear_all(self, temp_db):
         """Test clearing all data."""
         temp_db.add_memory("Memory")
@@ -165,22 +304,11 @@ class TestMemoryHandler:
     """Tests for MemoryHandler class."""
 
     @pytest.fixture
-    def handler(self):
+    def handler(self, cloned_db):
         """Create a memory handler with temp database."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        from memory.database import MemoryDatabase
         from memory.memory_handler import MemoryHandler
 
-        db = MemoryDatabase(db_path)
-        handler = MemoryHandler(db)
-
-        yield handler
-
-        # Cleanup
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+        return MemoryHandler(cloned_db)
 
     def test_remember_command(self, handler):
         """Test 'recuerda que' command."""
@@ -192,19 +320,17 @@ class TestMemoryHandler:
         memories = handler.db.search_memories("RSM")
         assert len(memories) == 1
 
-    def test_remember_variations(self, handler):
+    @pytest.mark.parametrize("cmd", [
+        "recuerda que tengo reunión mañana",
+        "anota que debo llamar a Juan",
+        "guarda que mi contraseña es segura",
+        "no olvides que el proyecto termina en marzo",
+    ])
+    def test_remember_variations(self, handler, cmd):
         """Test different remember command variations."""
-        commands = [
-            "recuerda que tengo reunión mañana",
-            "anota que debo llamar a Juan",
-            "guarda que mi contraseña es segura",
-            "no olvides que el proyecto termina en marzo",
-        ]
-
-        for cmd in commands:
-            is_cmd, response = handler.process_input(cmd)
-            assert is_cmd, f"Should recognize: {cmd}"
-            assert response is not None
+        is_cmd, response = handler.process_input(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
+        assert response is not None
 
     def test_forget_command(self, handler):
         """Test 'olvida' command."""
@@ -237,21 +363,16 @@ class TestMemoryHandler:
         # Verify name was stored
         assert handler.db.get_user_name() == "Tony"
 
-    def test_name_variations(self, handler):
+    @pytest.mark.parametrize("cmd,expected_name", [
+        ("soy Andrés", "Andrés"),
+        ("mi nombre es Carlos", "Carlos"),
+        ("puedes llamarme Pedro", "Pedro"),
+    ])
+    def test_name_variations(self, handler, cmd, expected_name):
         """Test different name introduction patterns."""
-        patterns = [
-            ("soy Andrés", "Andrés"),
-            ("mi nombre es Carlos", "Carlos"),
-            ("puedes llamarme Pedro", "Pedro"),
-        ]
-
-        for cmd, expected_name in patterns:
-            # Reset
-            handler.db.set_preference("user_name", None)
-
-            is_cmd, response = handler.process_input(cmd)
-            assert is_cmd, f"Should recognize: {cmd}"
-            assert handler.db.get_user_name() == expected_name
+        is_cmd, response = handler.process_input(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
+        assert handler.db.get_user_name() == expected_name
 
     def test_non_memory_command(self, handler):
         """Test non-memory commands pass through."""
@@ -259,6 +380,12 @@ class TestMemoryHandler:
         assert not is_cmd
         assert response is None
 
+    def test_command_inside_longer_phrase(self, handler):
+        """Test commands are still found after a leading address."""
+        is_cmd, response = handler.process_input("jarvis, recuerda que el vuelo sale a las 8")
+        assert is_cmd
+        assert len(handler.db.search_memories("vuelo")) == 1
+
     def test_session_management(self, handler):
         """Test session start and end."""
         session_id = handler.start_session()
@@ -296,85 +423,109 @@ class TestMemoryHandler:
         memories = handler.db.search_memories("café")
         assert memories[0]["category"] == "preferencias"
 
+    @pytest.mark.parametrize("content,expected", [
+        ("el cumpleaños de mi hija", "personal"),
+        ("el cumple de Juan es el día 3", "fechas"),
+        ("no me gusta el correo del jefe", "trabajo"),
+        ("prefiero su número de teléfono", "preferencias"),
+        ("algo sin categoría clara", "general"),
+    ])
+    def test_category_priority(self, handler, content, expected):
+        """Test the highest-priority matching category wins."""
+        assert handler._detect_category(content) == expected
+
+
+@pytest.fixture(scope="class")
+def class_tmpdir():
+    """One temporary directory per test class, removed in a single rmtree."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+@pytest.fixture
+def db_path(class_tmpdir):
+    """Unique database filename inside the class directory."""
+    return os.path.join(class_tmpdir, f"t{uuid.uuid4().hex}.db")
 
+
+@pytest.mark.serial
 class TestMemorySingleton:
     """Tests for singleton pattern."""
 
-    def test_get_memory_creates_instance(self):
+    def test_get_memory_creates_instance(self, db_path, monkeypatch):
         """Test that get_memory creates an instance."""
         from memory import database
 
-        # Reset singleton
-        database._memory_instance = None
+        # Reset singleton (restored by monkeypatch after the test)
+        monkeypatch.setattr(database, '_memory_instance', None)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = os.path.join(tmpdir, "test.db")
-            instance = database.get_memory(db_path)
-            assert instance is not None
+        instance = database.get_memory(db_path)
+        assert instance is not None
 
-    def test_get_memory_handler_creates_instance(self):
+    def test_get_memory_handler_creates_instance(self, db_path, monkeypatch):
         """Test that get_memory_handler creates an instance."""
         from memory import memory_handler, database
 
-        # Reset singletons
-        memory_handler._handler_instance = None
-        database._memory_instance = None
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = os.path.join(tmpdir, "test.db")
-            database._memory_instance = database.MemoryDatabase(db_path)
+        # Reset singletons (restored by monkeypatch after the test)
+        monkeypatch.setattr(memory_handler, '_handler_instance', None)
+        monkeypatch.setattr(database, '_memory_instance', database.MemoryDatabase(db_path))
 
-            handler = memory_handler.get_memory_handler()
-            assert handler is not None
+        handler = memory_handler.get_memory_handler()
+        assert handler is not None
 
 
 class TestMemoryPersistence:
     """Tests for memory persistence across instances."""
 
-    def test_data_persists_across_instances(self):
+    def test_data_persists_across_instances(self, db_path):
         """Test that data persists when database is reopened."""
         from memory.database import MemoryDatabase
 
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        try:
-            # First instance - write data
-            db1 = MemoryDatabase(db_path)
-            db1.set_user_name("Persistent User")
-            db1.add_memory("Persistent memory content")
-            del db1
-
-            # Second instance - read data
-            db2 = MemoryDatabase(db_path)
-            assert db2.get_user_name() == "Persistent User"
-            memories = db2.search_memories("Persistent")
-            assert len(memories) == 1
-        finally:
-            if os.path.exists(db_path):
-                os.unlink(db_path)
-
-    def test_sessions_persist(self):
+        # First instance - write data
+        db1 = MemoryDatabase(db_path)
+        db1.set_user_name("Persistent User")
+        db1.add_memory("Persistent memory content")
+        db1.close()
+
+        # Second instance - read data
+        db2 = MemoryDatabase(db_path)
+        assert db2.get_user_name() == "Persistent User"
+        memories = db2.search_memories("Persistent")
+        assert len(memories) == 1
+
+    def test_sessions_persist(self, db_path):
         """Test that session data persists."""
         from memory.database import MemoryDatabase
 
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        try:
-            # First instance
-            db1 = MemoryDatabase(db_path)
-            session_id = db1.start_session()
-            db1.add_conversation(session_id, "user", "Test message")
-            del db1
-
-            # Second instance
-            db2 = MemoryDatabase(db_path)
-            sessions = db2.get_recent_sessions()
-            assert len(sessions) == 1
-            history = db2.get_conversation_history(session_id)
-            assert len(history) == 1
-            assert history[0]["content"] == "Test message"
-        finally:
-            if os.path.exists(db_path):
-                os.unlink(db_path)
+        # First instance
+        db1 = MemoryDatabase(db_path)
+        session_id = db1.start_session()
+        db1.add_conversation(session_id, "user", "Test message")
+        db1.close()
+
+        # Second instance
+        db2 = MemoryDatabase(db_path)
+        sessions = db2.get_recent_sessions()
+        assert len(sessions) == 1
+        history = db2.get_conversation_history(session_id)
+        assert len(history) == 1
+        assert history[0]["content"] == "Test message"
+
+    def test_close_checkpoints_wal(self, db_path):
+        """Test close() folds the WAL back into the main database file."""
+        from memory.database import MemoryDatabase
+
+        db = MemoryDatabase(db_path)
+        db.add_memory("Checkpointed memory")
+        db.close()
+
+        wal_path = db_path + "-wal"
+        assert not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0
+
+    def test_close_twice(self, db_path):
+        """Test a second close() (signal handler, then run()) is a no-op."""
+        from memory.database import MemoryDatabase
+
+        db = MemoryDatabase(db_path)
+        db.close()
+        db.close()
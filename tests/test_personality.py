@@ -2,20 +2,41 @@
 Tests for JARVIS Personality module.
 """
 
+import copy
+import re
 import pytest
-from datetime import datetime
-from unittest.mock import patch
+from types import SimpleNamespace
+
+FAREWELL_RE = re.compile("pronto|día|servicio|luego")
+
+
+@pytest.fixture(scope="module")
+def personality_template():
+    """Build JarvisPersonality once for the whole module."""
+    from modules.personality import JarvisPersonality
+
+    return JarvisPersonality()
+
+
+@pytest.fixture
+def personality(personality_template):
+    """Per-test shallow copy so user_name/counters never leak between tests."""
+    return copy.copy(personality_template)
+
+
+@pytest.fixture
+def at_hour(monkeypatch):
+    """Pin the personality clock to a given hour of the day."""
+    def _set(hour):
+        monkeypatch.setattr('modules.personality._now', lambda: SimpleNamespace(hour=hour))
+    return _set
 
 
 class TestJarvisPersonality:
     """Tests for JarvisPersonality class."""
 
-    def test_initialization_default(self):
+    def test_initialization_default(self, personality):
         """Test default initialization."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-
         assert personality.user_name is None
         assert personality.formality_level == "formal"
         assert personality.conversation_count == 0
@@ -28,20 +49,14 @@ class TestJarvisPersonality:
 
         assert personality.user_name == "Tony"
 
-    def test_set_user_name(self):
+    def test_set_user_name(self, personality):
         """Test setting user name."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         personality.set_user_name("Stark")
 
         assert personality.user_name == "Stark"
 
-    def test_increment_conversation(self):
+    def test_increment_conversation(self, personality):
         """Test conversation counter."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         assert personality.conversation_count == 0
 
         personality.increment_conversation()
@@ -54,51 +69,24 @@ class TestJarvisPersonality:
 class TestGreetings:
     """Tests for greeting functionality."""
 
-    def test_morning_greeting(self):
-        """Test morning greeting (5-11)."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 9
-            greeting = personality.get_greeting()
+    @pytest.mark.parametrize("hour,expected", [
+        (9, "Buenos días"),
+        (15, "Buenas tardes"),
+        (21, "Buenas noches"),
+    ])
+    def test_greeting_by_time_of_day(self, personality, at_hour, hour, expected):
+        """Test greeting matches morning (5-11), afternoon (12-18), evening (19-4)."""
+        at_hour(hour)
+        greeting = personality.get_greeting()
 
-        assert "Buenos días" in greeting
+        assert expected in greeting
 
-    def test_afternoon_greeting(self):
-        """Test afternoon greeting (12-18)."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 15
-            greeting = personality.get_greeting()
-
-        assert "Buenas tardes" in greeting
-
-    def test_evening_greeting(self):
-        """Test evening greeting (19-4)."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 21
-            greeting = personality.get_greeting()
-
-        assert "Buenas noches" in greeting
-
-    def test_greeting_with_user_name(self):
+    def test_greeting_with_user_name(self, personality, at_hour):
         """Test greeting includes user name."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality(user_name="Tony")
+        personality.set_user_name("Tony")
 
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 10
-            greeting = personality.get_greeting()
+        at_hour(10)
+        greeting = personality.get_greeting()
 
         assert "Tony" in greeting
 
@@ -106,25 +94,16 @@ class TestGreetings:
 class TestWakeResponses:
     """Tests for wake word response functionality."""
 
-    def test_wake_response_not_empty(self):
+    def test_wake_response_not_empty(self, personality):
         """Test wake response is not empty."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         response = personality.get_wake_response()
 
         assert response
         assert len(response) > 0
 
-    def test_wake_response_variations(self):
+    def test_wake_response_variations(self, personality):
         """Test that wake responses have variations."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-        responses = set()
-
-        for _ in range(20):
-            responses.add(personality.get_wake_response())
+        responses = set(personality.get_wake_responses(20))
 
         # Should have at least 2 different responses
         assert len(responses) >= 2
@@ -133,11 +112,8 @@ class TestWakeResponses:
 class TestPhrases:
     """Tests for various phrase types."""
 
-    def test_confirmation_phrases(self):
+    def test_confirmation_phrases(self, personality):
         """Test confirmation phrases."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         confirmation = personality.get_confirmation()
 
         assert confirmation
@@ -149,180 +125,144 @@ class TestPhrases:
             "De acuerdo.",
         ]
 
-    def test_processing_messages(self):
+    def test_processing_messages(self, personality):
         """Test processing messages."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         processing = personality.get_processing_message()
 
         assert processing
         assert "..." in processing
 
-    def test_limitation_messages(self):
+    def test_limitation_messages(self, personality):
         """Test limitation messages."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         limitation = personality.get_limitation_message()
 
         assert limitation
         assert "temo" in limitation or "Lamentablemente" in limitation or "confesar" in limitation
 
-    def test_farewell_messages(self):
+    def test_farewell_messages(self, personality):
         """Test farewell messages."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         farewell = personality.get_farewell()
 
         assert farewell
-        assert any(word in farewell for word in ["pronto", "día", "servicio", "luego"])
+        assert FAREWELL_RE.search(farewell)
 
 
 class TestSystemPrompt:
     """Tests for system prompt generation."""
 
-    def test_system_prompt_not_empty(self):
+    def test_system_prompt_not_empty(self, personality):
         """Test system prompt is generated."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         prompt = personality.get_system_prompt()
 
         assert prompt
         assert len(prompt) > 100
 
-    def test_system_prompt_contains_jarvis_identity(self):
+    def test_system_prompt_contains_jarvis_identity(self, personality):
         """Test system prompt contains JARVIS identity."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         prompt = personality.get_system_prompt()
 
         assert "JARVIS" in prompt
 
-    def test_system_prompt_contains_personality_traits(self):
+    def test_system_prompt_contains_personality_traits(self, personality):
         """Test system prompt contains personality traits."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         prompt = personality.get_system_prompt()
 
         assert "señor" in prompt.lower()
         assert "británico" in prompt.lower() or "elegante" in prompt.lower()
 
-    def test_system_prompt_includes_user_name(self):
+    def test_system_prompt_includes_user_name(self, personality):
         """Test system prompt includes user name when set."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality(user_name="Tony")
+        personality.set_user_name("Tony")
         prompt = personality.get_system_prompt()
 
         assert "Tony" in prompt
 
-    def test_system_prompt_includes_time_context(self):
+    def test_system_prompt_includes_time_context(self, personality, at_hour):
         """Test system prompt includes time context."""
-        from modules.personality import JarvisPersonality
+        at_hour(10)
+        prompt = personality.get_system_prompt()
 
-        personality = JarvisPersonality()
+        assert "mañana" in prompt.lower()
 
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 10
-            prompt = personality.get_system_prompt()
+    def test_system_prompt_cached_per_context(self, personality, at_hour):
+        """Test the prompt is reused for the same name and time of day."""
+        at_hour(9)
+        first = personality.get_system_prompt()
+        at_hour(11)
+        assert personality.get_system_prompt() is first
 
-        assert "mañana" in prompt.lower()
+        personality.set_user_name("Tony")
+        assert "Tony" in personality.get_system_prompt()
 
 
 class TestStartupShutdown:
     """Tests for startup and shutdown messages."""
 
-    def test_startup_message_morning(self):
-        """Test startup message in morning."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
-
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 9
-            message = personality.get_startup_message()
+    @pytest.mark.parametrize("hour,expected", [
+        (9, "Buenos días"),
+        (15, "Buenas tardes"),
+    ])
+    def test_startup_message_by_time_of_day(self, personality, at_hour, hour, expected):
+        """Test startup message in morning and afternoon."""
+        at_hour(hour)
+        message = personality.get_startup_message()
 
         assert "JARVIS" in message
-        assert "Buenos días" in message
-
-    def test_startup_message_afternoon(self):
-        """Test startup message in afternoon."""
-        from modules.personality import JarvisPersonality
+        assert expected in message
 
-        personality = JarvisPersonality()
-
-        with patch('modules.personality.datetime') as mock_dt:
-            mock_dt.now.return_value.hour = 15
-            message = personality.get_startup_message()
-
-        assert "JARVIS" in message
-        assert "Buenas tardes" in message
-
-    def test_shutdown_message(self):
+    def test_shutdown_message(self, personality):
         """Test shutdown message."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         message = personality.get_shutdown_message()
 
         assert message
-        assert "Desactivando" in message or any(
-            word in message for word in ["pronto", "día", "servicio", "luego"]
-        )
+        assert "Desactivando" in message or FAREWELL_RE.search(message)
 
 
 class TestEnhanceResponse:
     """Tests for response enhancement."""
 
-    def test_enhance_response_passthrough(self):
+    def test_enhance_response_passthrough(self, personality):
         """Test that enhance_response passes through by default."""
-        from modules.personality import JarvisPersonality
-
-        personality = JarvisPersonality()
         original = "This is a test response."
         enhanced = personality.enhance_response(original)
 
         assert enhanced == original
 
 
+@pytest.mark.serial
 class TestGetPersonalitySingleton:
     """Tests for singleton pattern."""
 
-    def test_get_personality_creates_instance(self):
+    def test_get_personality_creates_instance(self, monkeypatch):
         """Test that get_personality creates an instance."""
         from modules import personality as p
 
-        # Reset singleton
-        p._personality_instance = None
+        # Reset singleton (restored by monkeypatch after the test)
+        monkeypatch.setattr(p, '_personality_instance', None)
 
         instance = p.get_personality()
 
         assert instance is not None
         assert isinstance(instance, p.JarvisPersonality)
 
-    def test_get_personality_returns_same_instance(self):
+    def test_get_personality_returns_same_instance(self, monkeypatch):
         """Test that get_personality returns the same instance."""
         from modules import personality as p
 
-        # Reset singleton
-        p._personality_instance = None
+        # Reset singleton (restored by monkeypatch after the test)
+        monkeypatch.setattr(p, '_personality_instance', None)
 
         instance1 = p.get_personality()
         instance2 = p.get_personality()
 
         assert instance1 is instance2
 
-    def test_get_personality_updates_user_name(self):
+    def test_get_personality_updates_user_name(self, monkeypatch):
         """Test that get_personality updates user name."""
         from modules import personality as p
 
-        # Reset singleton
-        p._personality_instance = None
+        # Reset singleton (restored by monkeypatch after the test)
+        monkeypatch.setattr(p, '_personality_instance', None)
 
         instance = p.get_personality(user_name="Tony")
         assert instance.user_name == "Tony"
@@ -0,0 +1,36 @@
+"""
+Tests for the JARVIS Reminder dataclass.
+"""
+
+from datetime import datetime
+
+from modules.reminders import Reminder
+
+
+class TestReminder:
+    """Tests for Reminder dataclass."""
+
+    def test_reminder_creation(self):
+        """Test creating a reminder."""
+        reminder = Reminder(
+            id=1,
+            message="Test",
+            trigger_time=datetime.now()
+        )
+
+        assert reminder.id == 1
+        assert reminder.message == "Test"
+        assert not reminder.triggered
+
+    def test_reminder_to_dict(self):
+        """Test converting reminder to dict."""
+        reminder = Reminder(
+            id=1,
+            message="Test",
+            trigger_time=datetime.now()
+        )
+
+        d = reminder.to_dict()
+        assert "id" in d
+        assert "message" in d
+        assert "trigger_time" in d
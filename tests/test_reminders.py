@@ -3,34 +3,76 @@ Tests for JARVIS Reminders module.
 """
 
 import pytest
-import tempfile
-import os
-import time
+import sqlite3
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
+from modules.reminders import Reminder, ReminderDatabase, ReminderManager, ReminderQueryHandler
+
+
+@pytest.fixture(scope="session")
+def shared_reminder_db():
+    """Create the reminder schema once, in memory, for the whole session."""
+    database = ReminderDatabase(":memory:")
+    # Throwaway database: trade durability for speed
+    with database._get_connection() as conn:
+        conn.executescript("""
+            PRAGMA journal_mode=MEMORY;
+            PRAGMA synchronous=OFF;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA locking_mode=EXCLUSIVE;
+        """)
+    return database
+
+
+@pytest.fixture
+def reminder_db(shared_reminder_db):
+    """Shared database wrapped in a transaction rolled back after each test."""
+    database = shared_reminder_db
+    # Unlike batch(), don't hold the lock for the whole test so the
+    # manager's check thread can still reach the database
+    with database._lock:
+        database._conn.execute("BEGIN")
+        database._in_batch = True
+
+    yield database
+
+    with database._lock:
+        database._in_batch = False
+        database._conn.rollback()
+
+
+class FakeClock:
+    """Stand-in for the reminders clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = datetime.now()
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the reminders clock; tests advance it explicitly."""
+    fake = FakeClock()
+    monkeypatch.setattr('modules.reminders._now', fake)
+    return fake
+
 
 class TestReminderDatabase:
     """Tests for ReminderDatabase class."""
 
     @pytest.fixture
-    def db(self):
+    def db(self, reminder_db):
         """Create a temporary database."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        from modules.reminders import ReminderDatabase
-        database = ReminderDatabase(db_path)
-
-        yield database
-
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+        return reminder_db
 
     def test_add_reminder(self, db):
         """Test adding a reminder."""
-        from modules.reminders import Reminder
-
         reminder = Reminder(
             id=None,
             message="Test reminder",
@@ -42,8 +84,6 @@ class TestReminderDatabase:
 
     def test_get_pending_reminders(self, db):
         """Test getting pending reminders."""
-        from modules.reminders import Reminder
-
         reminder = Reminder(
             id=None,
             message="Test reminder",
@@ -57,15 +97,12 @@ class TestReminderDatabase:
 
     def test_get_due_reminders(self, db):
         """Test getting due reminders."""
-        from modules.reminders import Reminder
-
         # Past reminder (due)
         past_reminder = Reminder(
             id=None,
             message="Past reminder",
             trigger_time=datetime.now() - timedelta(minutes=5)
         )
-        db.add_reminder(past_reminder)
 
         # Future reminder (not due)
         future_reminder = Reminder(
@@ -73,16 +110,64 @@ class TestReminderDatabase:
             message="Future reminder",
             trigger_time=datetime.now() + timedelta(hours=1)
         )
-        db.add_reminder(future_reminder)
+        assert db.add_reminders([past_reminder, future_reminder]) == 2
 
         due = db.get_due_reminders()
         assert len(due) == 1
         assert due[0].message == "Past reminder"
 
+    def test_due_reminders_use_index(self, db):
+        """Test the due lookup seeks the composite index without sorting."""
+        plan = db._conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM reminders
+            WHERE triggered = FALSE AND trigger_time <= ?
+            ORDER BY trigger_time ASC
+        """, (int(datetime.now().timestamp()),)).fetchall()
+        details = " ".join(row["detail"] for row in plan)
+
+        assert "USING INDEX idx_reminders_triggered_time" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_migrates_iso_trigger_times(self, tmp_path):
+        """Test ISO text trigger times from older databases become epoch seconds."""
+        db_path = tmp_path / "old_reminders.db"
+        past = datetime.now().replace(microsecond=0) - timedelta(minutes=5)
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message TEXT NOT NULL,
+                trigger_time TIMESTAMP NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                triggered BOOLEAN DEFAULT FALSE,
+                recurring BOOLEAN DEFAULT FALSE,
+                recurrence_minutes INTEGER DEFAULT 0
+            )
+        """)
+        conn.execute(
+            "INSERT INTO reminders (message, trigger_time, created_at) VALUES (?, ?, ?)",
+            ("Old reminder", past.isoformat(), past.isoformat())
+        )
+        conn.commit()
+        conn.close()
+
+        database = ReminderDatabase(str(db_path))
+        try:
+            due = database.get_due_reminders()
+            assert [r.message for r in due] == ["Old reminder"]
+            assert due[0].trigger_time == past
+        finally:
+            database.close()
+
+    def test_close_twice(self, tmp_path):
+        """Test a second close() (signal handler, then run()) is a no-op."""
+        database = ReminderDatabase(str(tmp_path / "reminders.db"))
+        database.close()
+        database.close()
+
     def test_mark_triggered(self, db):
         """Test marking reminder as triggered."""
-        from modules.reminders import Reminder
-
         reminder = Reminder(
             id=None,
             message="Test reminder",
@@ -96,8 +181,6 @@ class TestReminderDatabase:
 
     def test_delete_reminder(self, db):
         """Test deleting a reminder."""
-        from modules.reminders import Reminder
-
         reminder = Reminder(
             id=None,
             message="To delete",
@@ -127,24 +210,35 @@ class TestReminderDatabase:
         assert len(results) == 1
         assert "project" in results[0]["content"]
 
+    def test_search_voice_notes_short_and_tag_terms(self, db):
+        """Test short terms fall back to LIKE and tags are searchable."""
+        db.add_voice_note("Idea: app de recetas", ["cocina"])
+        db.add_voice_note("Llamar al banco", ["tramites"])
+
+        assert [n["content"] for n in db.search_voice_notes("ap")] == ["Idea: app de recetas"]
+        assert [n["content"] for n in db.search_voice_notes("COCINA")] == ["Idea: app de recetas"]
+
 
 class TestReminderManager:
     """Tests for ReminderManager class."""
 
-    @pytest.fixture
-    def manager(self):
-        """Create a reminder manager with temp database."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        from modules.reminders import ReminderManager
-        mgr = ReminderManager(db_path=db_path, check_interval=0.1)
+    @pytest.fixture(scope="class")
+    def shared_manager(self, shared_reminder_db):
+        """Create one reminder manager for the whole class."""
+        mgr = ReminderManager(check_interval=0.1, db=shared_reminder_db)
 
         yield mgr
 
         mgr.stop()
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+
+    @pytest.fixture
+    def manager(self, shared_manager, reminder_db):
+        """Shared manager; its database changes are rolled back per test."""
+        yield shared_manager
+
+        # Stop the check thread before the rollback and drop test callbacks
+        shared_manager.stop()
+        shared_manager.on_reminder = None
 
     def test_parse_reminder_minutes(self, manager):
         """Test parsing 'en X minutos' format."""
@@ -173,43 +267,39 @@ class TestReminderManager:
         assert is_reminder
         assert response is not None
 
-    def test_parse_reminder_variations(self, manager):
+    @pytest.mark.parametrize("phrase", [
+        "recuérdame que debo comprar leche",
+        "pon un recordatorio para revisar el informe",
+        "avísame cuando termine la descarga",
+    ])
+    def test_parse_reminder_variations(self, manager, phrase):
         """Test different reminder phrase variations."""
-        phrases = [
-            "recuérdame que debo comprar leche",
-            "pon un recordatorio para revisar el informe",
-            "avísame cuando termine la descarga",
-        ]
-
-        for phrase in phrases:
-            is_reminder, response = manager.parse_and_create_reminder(phrase)
-            assert is_reminder, f"Should recognize: {phrase}"
-
-    def test_parse_note(self, manager):
+        is_reminder, response = manager.parse_and_create_reminder(phrase)
+        assert is_reminder, f"Should recognize: {phrase}"
+
+    @pytest.mark.parametrize("phrase", [
+        "anota que mañana es el cumpleaños de María",
+        "toma nota de que el cliente necesita el reporte",
+        "guarda esta nota: ideas para el proyecto",
+    ])
+    def test_parse_note(self, manager, phrase):
         """Test parsing voice notes."""
-        phrases = [
-            "anota que mañana es el cumpleaños de María",
-            "toma nota de que el cliente necesita el reporte",
-            "guarda esta nota: ideas para el proyecto",
-        ]
-
-        for phrase in phrases:
-            is_note, response = manager.parse_and_create_note(phrase)
-            assert is_note, f"Should recognize: {phrase}"
+        is_note, response = manager.parse_and_create_note(phrase)
+        assert is_note, f"Should recognize: {phrase}"
 
-    def test_work_session_tracking(self, manager):
+    def test_work_session_tracking(self, manager, clock):
         """Test work session tracking."""
         manager.start()
-        time.sleep(0.2)
+        clock.advance(minutes=5)
 
         duration = manager.get_work_duration()
         assert duration is not None
-        assert duration.total_seconds() >= 0
+        assert duration == timedelta(minutes=5)
 
-    def test_reset_work_session(self, manager):
+    def test_reset_work_session(self, manager, clock):
         """Test resetting work session."""
         manager.start()
-        time.sleep(0.1)
+        clock.advance(hours=1)
 
         manager.reset_work_session()
         duration = manager.get_work_duration()
@@ -218,26 +308,24 @@ class TestReminderManager:
 
     def test_pending_reminders_summary(self, manager):
         """Test getting pending reminders summary."""
-        from modules.reminders import Reminder
-
-        manager.db.add_reminder(Reminder(
-            id=None,
-            message="Test reminder 1",
-            trigger_time=datetime.now() + timedelta(hours=1)
-        ))
-        manager.db.add_reminder(Reminder(
-            id=None,
-            message="Test reminder 2",
-            trigger_time=datetime.now() + timedelta(hours=2)
-        ))
+        manager.db.add_reminders([
+            Reminder(
+                id=None,
+                message="Test reminder 1",
+                trigger_time=datetime.now() + timedelta(hours=1)
+            ),
+            Reminder(
+                id=None,
+                message="Test reminder 2",
+                trigger_time=datetime.now() + timedelta(hours=2)
+            ),
+        ])
 
         summary = manager.get_pending_reminders_summary()
         assert "2 recordatorios" in summary
 
     def test_cancel_reminder(self, manager):
         """Test canceling a reminder."""
-        from modules.reminders import Reminder
-
         manager.db.add_reminder(Reminder(
             id=None,
             message="Reminder about meeting",
@@ -249,8 +337,6 @@ class TestReminderManager:
 
     def test_reminder_callback(self, manager):
         """Test reminder callback is called."""
-        from modules.reminders import Reminder
-
         reminders_triggered = []
 
         def on_reminder(msg):
@@ -275,45 +361,36 @@ class TestReminderQueryHandler:
     """Tests for ReminderQueryHandler class."""
 
     @pytest.fixture
-    def handler(self):
+    def handler(self, reminder_db):
         """Create a reminder query handler."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-
-        from modules.reminders import ReminderManager, ReminderQueryHandler
-        manager = ReminderManager(db_path=db_path)
+        manager = ReminderManager(check_interval=0.1, db=reminder_db)
         handler = ReminderQueryHandler(manager)
 
         yield handler
 
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+        manager.stop()
 
-    def test_list_reminders_query(self, handler):
+    @pytest.mark.parametrize("query", [
+        "qué recordatorios tengo",
+        "mis recordatorios",
+        "recordatorios pendientes",
+    ])
+    def test_list_reminders_query(self, handler, query):
         """Test listing reminders query."""
-        queries = [
-            "qué recordatorios tengo",
-            "mis recordatorios",
-            "recordatorios pendientes",
-        ]
-
-        for query in queries:
-            is_handled, response = handler.process_input(query)
-            assert is_handled, f"Should handle: {query}"
-
-    def test_work_time_query(self, handler):
+        is_handled, response = handler.process_input(query)
+        assert is_handled, f"Should handle: {query}"
+
+    @pytest.mark.parametrize("query", [
+        "cuánto llevo trabajando",
+        "cuánto llevo en la sesión",
+    ])
+    def test_work_time_query(self, handler, clock, query):
         """Test work time query."""
         handler.manager.start()
-        time.sleep(0.1)
+        clock.advance(minutes=10)
 
-        queries = [
-            "cuánto llevo trabajando",
-            "cuánto llevo en la sesión",
-        ]
-
-        for query in queries:
-            is_handled, response = handler.process_input(query)
-            assert is_handled, f"Should handle: {query}"
+        is_handled, response = handler.process_input(query)
+        assert is_handled, f"Should handle: {query}"
 
     def test_notes_query(self, handler):
         """Test notes query."""
@@ -324,36 +401,3 @@ class TestReminderQueryHandler:
         """Test non-reminder queries pass through."""
         is_handled, response = handler.process_input("qué hora es")
         assert not is_handled
-
-
-class TestReminder:
-    """Tests for Reminder dataclass."""
-
-    def test_reminder_creation(self):
-        """Test creating a reminder."""
-        from modules.reminders import Reminder
-
-        reminder = Reminder(
-            id=1,
-            message="Test",
-            trigger_time=datetime.now()
-        )
-
-        assert reminder.id == 1
-        assert reminder.message == "Test"
-        assert not reminder.triggered
-
-    def test_reminder_to_dict(self):
-        """Test converting reminder to dict."""
-        from modules.reminders import Reminder
-
-        reminder = Reminder(
-            id=1,
-            message="Test",
-            trigger_time=datetime.now()
-        )
-
-        d = reminder.to_dict()
-        assert "id" in d
-        assert "message" in d
-        assert "trigger_time" in d
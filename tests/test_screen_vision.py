@@ -3,31 +3,43 @@ Tests for JARVIS Screen Vision module.
 """
 
 import pytest
-import tempfile
 import os
+import subprocess
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from modules.screen_vision import CaptureResult, ScreenCapture, ScreenAnalyzer, ScreenQueryHandler
 
-class TestCaptureResult:
-    """Tests for CaptureResult dataclass."""
 
-    def test_capture_result_success(self):
-        """Test successful capture result."""
-        from modules.screen_vision import CaptureResult
+@pytest.fixture(autouse=True)
+def mock_subprocess_run(monkeypatch):
+    """Never fork capture tools or the Claude CLI; tests tweak the mock instead."""
+    mock_run = MagicMock(return_value=MagicMock(returncode=0, stderr="", stdout="ok"))
+    monkeypatch.setattr('modules.screen_vision.subprocess.run', mock_run)
+    return mock_run
 
-        result = CaptureResult(success=True, file_path="/tmp/screen.png")
-        assert result.success
-        assert result.file_path == "/tmp/screen.png"
-        assert result.error is None
 
-    def test_capture_result_failure(self):
-        """Test failed capture result."""
-        from modules.screen_vision import CaptureResult
+@pytest.fixture(scope="module", autouse=True)
+def spectacle_available():
+    """Report spectacle as installed for the whole module."""
+    # Module scope keeps the patch from leaking into other test modules
+    with patch('shutil.which', return_value="/usr/bin/spectacle"):
+        yield
+
+
+@pytest.fixture(scope="module")
+def screen_analyzer(spectacle_available):
+    """Build one ScreenAnalyzer for the module."""
+    # Tests only use patch.object on it, which is undone after each test
+    analyzer = ScreenAnalyzer(claude_command="claude")
+    yield analyzer
+    analyzer.capture.cleanup()
 
-        result = CaptureResult(success=False, error="No display")
-        assert not result.success
-        assert result.error == "No display"
+
+@pytest.fixture(scope="module")
+def screen_handler(screen_analyzer):
+    """Query handler wrapping the shared analyzer."""
+    return ScreenQueryHandler(screen_analyzer)
 
 
 class TestScreenCapture:
@@ -36,57 +48,28 @@ class TestScreenCapture:
     @pytest.fixture
     def screen_capture(self):
         """Create a ScreenCapture instance."""
-        from modules.screen_vision import ScreenCapture
-        with patch('shutil.which', return_value="/usr/bin/spectacle"):
-            capture = ScreenCapture()
-            yield capture
-            capture.cleanup()
+        capture = ScreenCapture()
+        yield capture
+        capture.cleanup()
 
     def test_initialization(self, screen_capture):
         """Test ScreenCapture initialization."""
         assert screen_capture.capture_tool is not None
         assert screen_capture.temp_dir is not None
 
-    def test_detect_spectacle(self):
-        """Test detecting spectacle tool."""
-        from modules.screen_vision import ScreenCapture
-
-        def which_mock(cmd):
-            return "/usr/bin/spectacle" if cmd == "spectacle" else None
-
-        with patch('shutil.which', side_effect=which_mock):
-            capture = ScreenCapture()
-            assert capture.capture_tool == "spectacle"
-            capture.cleanup()
-
-    def test_detect_scrot(self):
-        """Test detecting scrot tool."""
-        from modules.screen_vision import ScreenCapture
-
+    @pytest.mark.parametrize("tool_name", ["spectacle", "scrot", "import"])
+    def test_detect_tool(self, tool_name):
+        """Test detecting each supported capture tool."""
         def which_mock(cmd):
-            return "/usr/bin/scrot" if cmd == "scrot" else None
+            return f"/usr/bin/{tool_name}" if cmd == tool_name else None
 
         with patch('shutil.which', side_effect=which_mock):
             capture = ScreenCapture()
-            assert capture.capture_tool == "scrot"
-            capture.cleanup()
-
-    def test_detect_import(self):
-        """Test detecting ImageMagick import."""
-        from modules.screen_vision import ScreenCapture
-
-        def which_mock(cmd):
-            return "/usr/bin/import" if cmd == "import" else None
-
-        with patch('shutil.which', side_effect=which_mock):
-            capture = ScreenCapture()
-            assert capture.capture_tool == "import"
+            assert capture.capture_tool == tool_name
             capture.cleanup()
 
     def test_no_tool_available(self):
         """Test when no capture tool is available."""
-        from modules.screen_vision import ScreenCapture
-
         with patch('shutil.which', return_value=None):
             capture = ScreenCapture()
             assert capture.capture_tool is None
@@ -95,35 +78,24 @@ class TestScreenCapture:
             assert "no hay herramientas" in result.error.lower()
             capture.cleanup()
 
-    def test_capture_screen_success(self, screen_capture):
+    def test_capture_screen_success(self, screen_capture, mock_subprocess_run):
         """Test successful screen capture."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stderr="")
-
-            # Create temp file to simulate capture
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
-                temp_path = f.name
-
-            try:
-                with patch.object(screen_capture, '_get_capture_args',
-                                  return_value=["touch", temp_path]):
-                    # Simulate the file being created
-                    Path(temp_path).touch()
-                    result = screen_capture.capture_screen(temp_path)
-
-                    assert result.success or result.error  # Either success or meaningful error
-            finally:
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-
-    def test_capture_timeout(self, screen_capture):
+        filename = "/tmp/jarvis_test/capture.png"
+
+        with patch('modules.screen_vision.os.path.exists', return_value=True):
+            result = screen_capture.capture_screen(filename)
+
+        assert result.success is True
+        assert result.file_path == filename
+        assert mock_subprocess_run.call_args.args[0] == screen_capture._get_capture_args(filename)
+
+    def test_capture_timeout(self, screen_capture, mock_subprocess_run):
         """Test capture timeout handling."""
-        import subprocess
+        mock_subprocess_run.side_effect = subprocess.TimeoutExpired("cmd", 10)
 
-        with patch('subprocess.run', side_effect=subprocess.TimeoutExpired("cmd", 10)):
-            result = screen_capture.capture_screen()
-            assert not result.success
-            assert "tardó demasiado" in result.error.lower()
+        result = screen_capture.capture_screen()
+        assert not result.success
+        assert "tardó demasiado" in result.error.lower()
 
     def test_cleanup(self, screen_capture):
         """Test cleanup removes files."""
@@ -140,13 +112,9 @@ class TestScreenAnalyzer:
     """Tests for ScreenAnalyzer class."""
 
     @pytest.fixture
-    def analyzer(self):
+    def analyzer(self, screen_analyzer):
         """Create a ScreenAnalyzer instance."""
-        from modules.screen_vision import ScreenAnalyzer
-
-        with patch('shutil.which', return_value="/usr/bin/spectacle"):
-            analyzer = ScreenAnalyzer(claude_command="claude")
-            yield analyzer
+        return screen_analyzer
 
     def test_initialization(self, analyzer):
         """Test ScreenAnalyzer initialization."""
@@ -156,7 +124,6 @@ class TestScreenAnalyzer:
     def test_analyze_screen_capture_fails(self, analyzer):
         """Test analyze when capture fails."""
         with patch.object(analyzer.capture, 'capture_screen') as mock_capture:
-            from modules.screen_vision import CaptureResult
             mock_capture.return_value = CaptureResult(
                 success=False,
                 error="Display not available"
@@ -165,31 +132,24 @@ class TestScreenAnalyzer:
             result = analyzer.analyze_screen()
             assert "no pude capturar" in result.lower()
 
-    def test_analyze_screen_success(self, analyzer):
+    def test_analyze_screen_success(self, analyzer, tmp_path, mock_subprocess_run):
         """Test successful screen analysis."""
-        from modules.screen_vision import CaptureResult
-
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
-            temp_path = f.name
-
-        try:
-            with patch.object(analyzer.capture, 'capture_screen') as mock_capture:
-                mock_capture.return_value = CaptureResult(
-                    success=True,
-                    file_path=temp_path
-                )
-
-                with patch('subprocess.run') as mock_run:
-                    mock_run.return_value = MagicMock(
-                        returncode=0,
-                        stdout="Esta es una descripción de la pantalla."
-                    )
-
-                    result = analyzer.analyze_screen()
-                    assert "descripción" in result.lower() or len(result) > 0
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        temp_path = tmp_path / "capture.png"
+        temp_path.touch()
+
+        with patch.object(analyzer.capture, 'capture_screen') as mock_capture:
+            mock_capture.return_value = CaptureResult(
+                success=True,
+                file_path=str(temp_path)
+            )
+
+            mock_subprocess_run.return_value = MagicMock(
+                returncode=0,
+                stdout="Esta es una descripción de la pantalla."
+            )
+
+            result = analyzer.analyze_screen()
+            assert "descripción" in result.lower() or len(result) > 0
 
     def test_read_screen_text(self, analyzer):
         """Test reading screen text."""
@@ -231,67 +191,30 @@ class TestScreenQueryHandler:
     """Tests for ScreenQueryHandler class."""
 
     @pytest.fixture
-    def handler(self):
+    def handler(self, screen_handler):
         """Create a ScreenQueryHandler instance."""
-        from modules.screen_vision import ScreenQueryHandler, ScreenAnalyzer
-
-        with patch('shutil.which', return_value="/usr/bin/spectacle"):
-            analyzer = ScreenAnalyzer()
-            handler = ScreenQueryHandler(analyzer)
-            yield handler
-
-    def test_describe_screen_queries(self, handler):
-        """Test screen description queries."""
-        queries = [
-            "qué hay en mi pantalla",
-            "qué hay en pantalla",
-            "describe la pantalla",
-            "qué ves en pantalla",
-        ]
-
-        with patch.object(handler.analyzer, 'describe_screen', return_value="Pantalla"):
-            for query in queries:
-                is_handled, response = handler.process_query(query)
-                assert is_handled, f"Should handle: {query}"
-
-    def test_read_text_queries(self, handler):
-        """Test text reading queries."""
-        queries = [
-            "lee el texto de la pantalla",
-            "lee el texto en pantalla",
-            "qué texto hay en pantalla",
-        ]
-
-        with patch.object(handler.analyzer, 'read_screen_text', return_value="Texto"):
-            for query in queries:
-                is_handled, response = handler.process_query(query)
-                assert is_handled, f"Should handle: {query}"
-
-    def test_active_app_queries(self, handler):
-        """Test active application queries."""
-        queries = [
-            "qué aplicación tengo abierta",
-            "qué programa está abierto",
-            "qué app tengo abierta",
-        ]
-
-        with patch.object(handler.analyzer, 'identify_active_app', return_value="Firefox"):
-            for query in queries:
-                is_handled, response = handler.process_query(query)
-                assert is_handled, f"Should handle: {query}"
-
-    def test_error_queries(self, handler):
-        """Test error detection queries."""
-        queries = [
-            "hay algún error en pantalla",
-            "hay errores visibles",
-            "qué errores hay",
-        ]
-
-        with patch.object(handler.analyzer, 'check_for_errors', return_value="No errors"):
-            for query in queries:
-                is_handled, response = handler.process_query(query)
-                assert is_handled, f"Should handle: {query}"
+        return screen_handler
+
+    @pytest.mark.parametrize("method,query", [
+        ("describe_screen", "qué hay en mi pantalla"),
+        ("describe_screen", "qué hay en pantalla"),
+        ("describe_screen", "describe la pantalla"),
+        ("describe_screen", "qué ves en pantalla"),
+        ("read_screen_text", "lee el texto de la pantalla"),
+        ("read_screen_text", "lee el texto en pantalla"),
+        ("read_screen_text", "qué texto hay en pantalla"),
+        ("identify_active_app", "qué aplicación tengo abierta"),
+        ("identify_active_app", "qué programa está abierto"),
+        ("identify_active_app", "qué app tengo abierta"),
+        ("check_for_errors", "hay algún error en pantalla"),
+        ("check_for_errors", "hay errores visibles"),
+        ("check_for_errors", "qué errores hay"),
+    ])
+    def test_query_dispatch(self, handler, method, query):
+        """Test screen queries are handled with the analyzer method stubbed."""
+        with patch.object(handler.analyzer, method, return_value="Respuesta"):
+            is_handled, response = handler.process_query(query)
+            assert is_handled, f"Should handle: {query}"
 
     def test_screenshot_query(self, handler):
         """Test screenshot capture query."""
@@ -299,41 +222,35 @@ class TestScreenQueryHandler:
             is_handled, response = handler.process_query("captura la pantalla")
             assert is_handled
 
-    def test_non_screen_query(self, handler):
+    @pytest.mark.parametrize("query", [
+        "qué hora es",
+        "abre firefox",
+        "cuánta memoria hay",
+    ])
+    def test_non_screen_query(self, handler, query):
         """Test non-screen queries pass through."""
-        queries = [
-            "qué hora es",
-            "abre firefox",
-            "cuánta memoria hay",
-        ]
-
-        for query in queries:
-            is_handled, response = handler.process_query(query)
-            assert not is_handled, f"Should NOT handle: {query}"
+        is_handled, response = handler.process_query(query)
+        assert not is_handled, f"Should NOT handle: {query}"
 
 
+@pytest.mark.serial
 class TestSingletons:
     """Tests for singleton functions."""
 
-    def test_get_screen_analyzer(self):
-        """Test get_screen_analyzer returns instance."""
+    @pytest.fixture
+    def fresh_singletons(self, monkeypatch):
+        """Reset module singletons (restored by monkeypatch after the test)."""
         from modules import screen_vision
 
-        # Reset singleton
-        screen_vision._analyzer_instance = None
-
-        with patch('shutil.which', return_value="/usr/bin/spectacle"):
-            analyzer = screen_vision.get_screen_analyzer()
-            assert analyzer is not None
-
-    def test_get_screen_handler(self):
-        """Test get_screen_handler returns instance."""
-        from modules import screen_vision
+        monkeypatch.setattr(screen_vision, '_analyzer_instance', None)
+        monkeypatch.setattr(screen_vision, '_handler_instance', None)
+        return screen_vision
 
-        # Reset singletons
-        screen_vision._analyzer_instance = None
-        screen_vision._handler_instance = None
+    @pytest.mark.parametrize("getter", ["get_screen_analyzer", "get_screen_handler"])
+    def test_singleton_getter(self, fresh_singletons, getter):
+        """Test each getter creates an instance once and then reuses it."""
+        get_instance = getattr(fresh_singletons, getter)
 
-        with patch('shutil.which', return_value="/usr/bin/spectacle"):
-            handler = screen_vision.get_screen_handler()
-            assert handler is not None
+        instance = get_instance()
+        assert instance is not None
+        assert get_instance() is instance
@@ -5,14 +5,20 @@ Tests for JARVIS Sounds and UI modules.
 import pytest
 from unittest.mock import patch, MagicMock
 
+import sounds
+import ui
+from sounds import SoundEvent, SoundManager, get_sound_manager
+from ui import JarvisState, WidgetController, WidgetManager, get_widget_controller, get_widget_manager
+
+# More commands than the default history limit
+COMMANDS = tuple(f"comando {i}" for i in range(10))
+
 
 class TestSoundEvent:
     """Tests for SoundEvent enum."""
 
     def test_sound_events(self):
         """Test SoundEvent enum values."""
-        from sounds import SoundEvent
-
         assert SoundEvent.STARTUP.value == "startup"
         assert SoundEvent.LISTENING.value == "listening"
         assert SoundEvent.COMPLETE.value == "complete"
@@ -25,8 +31,6 @@ class TestSoundManager:
     @pytest.fixture
     def sound_manager(self):
         """Create a SoundManager instance."""
-        from sounds import SoundManager
-
         with patch('shutil.which', return_value="/usr/bin/paplay"):
             manager = SoundManager(enabled=True)
             yield manager
@@ -56,49 +60,47 @@ class TestSoundManager:
         sound_manager.set_volume(-0.5)
         assert sound_manager._volume == 0.0
 
-    def test_play_disabled(self, sound_manager):
+    def test_play_disabled(self, sound_manager, monkeypatch):
         """Test that play does nothing when disabled."""
-        from sounds import SoundEvent
-
         sound_manager.set_enabled(False)
+        mock_play = MagicMock()
+        mock_tones = MagicMock()
+        monkeypatch.setattr(sound_manager, '_play_file', mock_play)
+        monkeypatch.setattr(sound_manager, '_play_tones', mock_tones)
 
-        with patch.object(sound_manager, '_play_file') as mock_play:
-            with patch.object(sound_manager, '_play_tones') as mock_tones:
-                sound_manager.play(SoundEvent.STARTUP)
+        sound_manager.play(SoundEvent.STARTUP)
 
-                mock_play.assert_not_called()
-                mock_tones.assert_not_called()
+        mock_play.assert_not_called()
+        mock_tones.assert_not_called()
 
-    def test_play_file_not_found(self, sound_manager):
+    def test_play_file_not_found(self, sound_manager, monkeypatch):
         """Test playing when WAV file not found."""
-        from sounds import SoundEvent
+        mock_tones = MagicMock()
+        monkeypatch.setattr(sound_manager, '_play_tones', mock_tones)
 
-        with patch.object(sound_manager, '_play_tones') as mock_tones:
-            sound_manager.play(SoundEvent.STARTUP)
-            # Should fall back to tones
-            mock_tones.assert_called_once()
+        sound_manager.play(SoundEvent.STARTUP)
+        # Should fall back to tones
+        mock_tones.assert_called_once()
 
-    def test_convenience_methods(self, sound_manager):
+    def test_convenience_methods(self, sound_manager, monkeypatch):
         """Test convenience play methods."""
-        with patch.object(sound_manager, 'play') as mock_play:
-            from sounds import SoundEvent
+        mock_play = MagicMock()
+        monkeypatch.setattr(sound_manager, 'play', mock_play)
 
-            sound_manager.play_startup()
-            mock_play.assert_called_with(SoundEvent.STARTUP)
+        sound_manager.play_startup()
+        mock_play.assert_called_with(SoundEvent.STARTUP)
 
-            sound_manager.play_listening()
-            mock_play.assert_called_with(SoundEvent.LISTENING)
+        sound_manager.play_listening()
+        mock_play.assert_called_with(SoundEvent.LISTENING)
 
-            sound_manager.play_complete()
-            mock_play.assert_called_with(SoundEvent.COMPLETE)
+        sound_manager.play_complete()
+        mock_play.assert_called_with(SoundEvent.COMPLETE)
 
-            sound_manager.play_error()
-            mock_play.assert_called_with(SoundEvent.ERROR)
+        sound_manager.play_error()
+        mock_play.assert_called_with(SoundEvent.ERROR)
 
     def test_no_player_available(self):
         """Test when no audio player is available."""
-        from sounds import SoundManager
-
         with patch('shutil.which', return_value=None):
             manager = SoundManager()
             assert manager.player is None
@@ -109,8 +111,6 @@ class TestJarvisState:
 
     def test_state_values(self):
         """Test JarvisState enum values."""
-        from ui import JarvisState
-
         assert JarvisState.IDLE.value == "idle"
         assert JarvisState.LISTENING.value == "listening"
         assert JarvisState.PROCESSING.value == "processing"
@@ -121,25 +121,35 @@ class TestJarvisState:
 class TestWidgetController:
     """Tests for WidgetController class."""
 
+    @pytest.fixture(scope="class")
+    def shared_controller(self):
+        """Create one WidgetController for the whole class."""
+        return WidgetController()
+
     @pytest.fixture
-    def controller(self):
-        """Create a WidgetController instance."""
-        from ui import WidgetController
+    def controller(self, shared_controller):
+        """Shared controller reset to its initial state."""
+        shared_controller.state = JarvisState.IDLE
+        shared_controller.message = ""
+        shared_controller.command_history.clear()
+        shared_controller.callbacks.clear()
+        return shared_controller
 
-        return WidgetController()
+    @pytest.fixture
+    def callback(self, controller):
+        """Mock callback registered on the controller."""
+        mock_callback = MagicMock()
+        controller.add_callback(mock_callback)
+        return mock_callback
 
     def test_initialization(self, controller):
         """Test WidgetController initialization."""
-        from ui import JarvisState
-
         assert controller.state == JarvisState.IDLE
         assert controller.message == ""
-        assert controller.command_history == []
+        assert len(controller.command_history) == 0
 
     def test_set_state(self, controller):
         """Test setting state."""
-        from ui import JarvisState
-
         controller.set_state(JarvisState.LISTENING, "Esperando...")
 
         assert controller.state == JarvisState.LISTENING
@@ -155,30 +165,33 @@ class TestWidgetController:
 
     def test_command_history_limit(self, controller):
         """Test command history respects max limit."""
-        for i in range(10):
-            controller.add_command(f"comando {i}")
+        for command in COMMANDS:
+            controller.add_command(command)
 
-        assert len(controller.command_history) == controller.max_history
+        assert len(controller.command_history) == controller.max_history == 5
+        assert controller.command_history[0] == "comando 9"
 
-    def test_callback_notification(self, controller):
-        """Test that callbacks are notified."""
-        from ui import JarvisState
+    def test_max_history_read_only(self, controller):
+        """Test the history limit can't drift from the deque's maxlen."""
+        with pytest.raises(AttributeError):
+            controller.max_history = 10
 
-        callback_called = []
+    def test_add_commands(self, controller):
+        """Test bulk add keeps the newest commands first within the limit."""
+        controller.add_commands(COMMANDS)
 
-        def callback(state, message):
-            callback_called.append((state, message))
+        assert list(controller.command_history) == [
+            "comando 9", "comando 8", "comando 7", "comando 6", "comando 5"
+        ]
 
-        controller.add_callback(callback)
+    def test_callback_notification(self, controller, callback):
+        """Test that callbacks are notified."""
         controller.set_state(JarvisState.PROCESSING, "test")
 
-        assert len(callback_called) == 1
-        assert callback_called[0] == (JarvisState.PROCESSING, "test")
+        callback.assert_called_once_with(JarvisState.PROCESSING, "test")
 
     def test_get_state_text(self, controller):
         """Test getting human-readable state text."""
-        from ui import JarvisState
-
         controller.set_state(JarvisState.LISTENING)
         text = controller.get_state_text()
 
@@ -186,8 +199,6 @@ class TestWidgetController:
 
     def test_get_status_summary(self, controller):
         """Test getting status summary."""
-        from ui import JarvisState
-
         controller.set_state(JarvisState.IDLE, "En espera")
         controller.add_command("hola jarvis")
 
@@ -200,14 +211,21 @@ class TestWidgetController:
 class TestWidgetManager:
     """Tests for WidgetManager class."""
 
-    @pytest.fixture
-    def manager(self):
-        """Create a WidgetManager instance."""
-        from ui import WidgetManager
-
+    @pytest.fixture(scope="class")
+    def shared_manager(self):
+        """Create one WidgetManager for the whole class."""
         # Disable Qt to avoid GUI issues in tests
         return WidgetManager(enabled=False)
 
+    @pytest.fixture
+    def manager(self, shared_manager):
+        """Shared manager with its controller reset."""
+        controller = shared_manager.controller
+        controller.state = JarvisState.IDLE
+        controller.message = ""
+        controller.command_history.clear()
+        return shared_manager
+
     def test_initialization(self, manager):
         """Test WidgetManager initialization."""
         assert not manager.enabled
@@ -215,8 +233,6 @@ class TestWidgetManager:
 
     def test_set_state(self, manager):
         """Test setting state through manager."""
-        from ui import JarvisState
-
         manager.set_state(JarvisState.LISTENING, "test")
 
         assert manager.controller.state == JarvisState.LISTENING
@@ -228,39 +244,29 @@ class TestWidgetManager:
         assert "test command" in manager.controller.command_history
 
 
+@pytest.mark.serial
 class TestSingletons:
     """Tests for singleton functions."""
 
-    def test_get_sound_manager(self):
-        """Test get_sound_manager returns instance."""
-        from sounds import get_sound_manager
-        import sounds
-
-        # Reset singleton
-        sounds._sound_manager = None
+    @pytest.fixture
+    def reset_singletons(self, monkeypatch):
+        """Reset module singletons (restored by monkeypatch after the test)."""
+        monkeypatch.setattr(sounds, '_sound_manager', None)
+        monkeypatch.setattr(ui, '_widget_controller', None)
+        monkeypatch.setattr(ui, '_widget_manager', None)
 
+    def test_get_sound_manager(self, reset_singletons):
+        """Test get_sound_manager returns instance."""
         with patch('shutil.which', return_value="/usr/bin/paplay"):
             manager = get_sound_manager()
             assert manager is not None
 
-    def test_get_widget_controller(self):
+    def test_get_widget_controller(self, reset_singletons):
         """Test get_widget_controller returns instance."""
-        from ui import get_widget_controller
-        import ui
-
-        # Reset singleton
-        ui._widget_controller = None
-
         controller = get_widget_controller()
         assert controller is not None
 
-    def test_get_widget_manager(self):
+    def test_get_widget_manager(self, reset_singletons):
         """Test get_widget_manager returns instance."""
-        from ui import get_widget_manager
-        import ui
-
-        # Reset singleton
-        ui._widget_manager = None
-
         manager = get_widget_manager(enabled=False)
         assert manager is not None
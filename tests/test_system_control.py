@@ -2,29 +2,47 @@
 Tests for JARVIS System Control module.
 """
 
-import pytest
-import tempfile
 import os
+import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-from pathlib import Path
 
+from modules import system_control as sc
+from modules.system_control import ActionResult, ActionRisk, ControlQueryHandler, SystemControl
 
-class TestSystemControl:
-    """Tests for SystemControl class."""
 
-    @pytest.fixture
-    def control(self):
-        """Create a system control instance with temp log."""
-        with tempfile.NamedTemporaryFile(suffix='.log', delete=False) as f:
-            log_path = f.name
+@pytest.fixture
+def run_ok():
+    """Successful subprocess.run result (plain data, no mock machinery)."""
+    return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+
+@pytest.fixture
+def patched_subprocess(monkeypatch, run_ok):
+    """Report every CLI tool as installed and make subprocess calls succeed."""
+    mock_run = MagicMock(return_value=run_ok)
+    monkeypatch.setattr('subprocess.run', mock_run)
+    monkeypatch.setattr('subprocess.Popen', MagicMock())
+    monkeypatch.setattr('shutil.which', lambda cmd: f"/usr/bin/{cmd}")
+    return mock_run
+
+
+@pytest.fixture(scope="module")
+def shared_control():
+    """Create one system control instance whose action log is discarded."""
+    return SystemControl(log_file=os.devnull)
+
 
-        from modules.system_control import SystemControl
-        ctrl = SystemControl(log_file=log_path)
+@pytest.fixture
+def control(shared_control):
+    """Shared system control with its per-test state cleared."""
+    shared_control._pending_confirmation = None
+    shared_control.action_history.clear()
+    return shared_control
 
-        yield ctrl
 
-        if os.path.exists(log_path):
-            os.unlink(log_path)
+class TestSystemControl:
+    """Tests for SystemControl class."""
 
     def test_initialization(self, control):
         """Test control initialization."""
@@ -44,49 +62,34 @@ class TestSystemControl:
         result = control._find_application("firefox")
         assert result == "firefox"
 
-    def test_assess_risk_safe(self, control):
+    @pytest.mark.parametrize("cmd", [
+        "ls -la",
+        "pwd",
+        "cat file.txt",
+        "echo hello",
+    ])
+    def test_assess_risk_safe(self, control, cmd):
         """Test safe command assessment."""
-        from modules.system_control import ActionRisk
-
-        safe_commands = [
-            "ls -la",
-            "pwd",
-            "cat file.txt",
-            "echo hello",
-        ]
-
-        for cmd in safe_commands:
-            risk = control._assess_risk(cmd)
-            assert risk == ActionRisk.SAFE, f"Should be safe: {cmd}"
-
-    def test_assess_risk_dangerous(self, control):
+        assert control._assess_risk(cmd) == ActionRisk.SAFE, f"Should be safe: {cmd}"
+
+    @pytest.mark.parametrize("cmd", [
+        "rm -rf folder",
+        "sudo apt install",
+        "killall process",
+        "shutdown now",
+    ])
+    def test_assess_risk_dangerous(self, control, cmd):
         """Test dangerous command assessment."""
-        from modules.system_control import ActionRisk
-
-        dangerous_commands = [
-            "rm -rf folder",
-            "sudo apt install",
-            "killall process",
-            "shutdown now",
-        ]
-
-        for cmd in dangerous_commands:
-            risk = control._assess_risk(cmd)
-            assert risk == ActionRisk.DANGEROUS, f"Should be dangerous: {cmd}"
-
-    def test_assess_risk_forbidden(self, control):
+        assert control._assess_risk(cmd) == ActionRisk.DANGEROUS, f"Should be dangerous: {cmd}"
+
+    @pytest.mark.parametrize("cmd", [
+        "rm -rf /",
+        "rm -rf /*",
+        "dd of=/dev/sda",
+    ])
+    def test_assess_risk_forbidden(self, control, cmd):
         """Test forbidden command assessment."""
-        from modules.system_control import ActionRisk
-
-        forbidden_commands = [
-            "rm -rf /",
-            "rm -rf /*",
-            "dd of=/dev/sda",
-        ]
-
-        for cmd in forbidden_commands:
-            risk = control._assess_risk(cmd)
-            assert risk == ActionRisk.FORBIDDEN, f"Should be forbidden: {cmd}"
+        assert control._assess_risk(cmd) == ActionRisk.FORBIDDEN, f"Should be forbidden: {cmd}"
 
     @patch('subprocess.Popen')
     @patch('shutil.which')
@@ -110,84 +113,34 @@ class TestSystemControl:
         assert not result.success
         assert "no encontré" in result.message.lower()
 
-    @patch('subprocess.run')
-    def test_close_application(self, mock_run, control):
+    def test_close_application(self, control, patched_subprocess):
         """Test closing application."""
-        mock_run.return_value = MagicMock(returncode=0)
-
         result = control.close_application("firefox")
 
         assert result.success or "no encontré" in result.message.lower()
 
-    @patch('subprocess.run')
-    @patch('shutil.which')
-    def test_set_volume_pactl(self, mock_which, mock_run, control):
-        """Test setting volume with pactl."""
-        mock_which.return_value = "/usr/bin/pactl"
-        mock_run.return_value = MagicMock(returncode=0)
-
-        result = control.set_volume(50)
-
-        assert result.success
-        assert "50%" in result.message
-
-    @patch('subprocess.run')
-    @patch('shutil.which')
-    def test_change_volume(self, mock_which, mock_run, control):
-        """Test changing volume."""
-        mock_which.return_value = "/usr/bin/pactl"
-        mock_run.return_value = MagicMock(returncode=0)
-
-        result = control.change_volume(10)
-
-        assert result.success
-        assert "subido" in result.message.lower()
-
-    @patch('subprocess.run')
-    @patch('shutil.which')
-    def test_mute(self, mock_which, mock_run, control):
-        """Test muting audio."""
-        mock_which.return_value = "/usr/bin/pactl"
-        mock_run.return_value = MagicMock(returncode=0)
-
-        result = control.mute(True)
-
-        assert result.success
-        assert "silenciado" in result.message.lower()
-
-    @patch('subprocess.run')
-    @patch('shutil.which')
-    def test_unmute(self, mock_which, mock_run, control):
-        """Test unmuting audio."""
-        mock_which.return_value = "/usr/bin/pactl"
-        mock_run.return_value = MagicMock(returncode=0)
-
-        result = control.mute(False)
+    @pytest.mark.parametrize("method,args,expected", [
+        ("set_volume", (50,), "50%"),
+        ("change_volume", (10,), "subido"),
+        ("mute", (True,), "silenciado"),
+        ("mute", (False,), "activado"),
+    ])
+    def test_volume_actions(self, control, patched_subprocess, method, args, expected):
+        """Test volume and mute actions through pactl."""
+        result = getattr(control, method)(*args)
 
         assert result.success
-        assert "activado" in result.message.lower()
+        assert expected in result.message.lower()
 
-    @patch('subprocess.run')
-    @patch('shutil.which')
-    def test_set_brightness(self, mock_which, mock_run, control):
+    def test_set_brightness(self, control, patched_subprocess):
         """Test setting brightness."""
-        mock_which.return_value = "/usr/bin/brightnessctl"
-        mock_run.return_value = MagicMock(returncode=0)
-
         result = control.set_brightness(70)
 
         assert result.success
         assert "70%" in result.message
 
-    @patch('subprocess.run')
-    def test_execute_command_safe(self, mock_run, control):
+    def test_execute_command_safe(self, control, patched_subprocess):
         """Test executing safe command."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="output",
-            stderr=""
-        )
-
         result = control.execute_command("echo hello")
 
         assert result.success
@@ -219,13 +172,16 @@ class TestSystemControl:
         assert "cancelada" in result.message.lower()
         assert not control.has_pending_confirmation()
 
-    def test_action_logging(self, control):
+    def test_action_logging(self, control, patched_subprocess, tmp_path, monkeypatch):
         """Test action logging."""
+        log_file = tmp_path / "actions.log"
+        monkeypatch.setattr(control, 'log_file', log_file)
+
         # Perform an action
         control.set_volume(50)
 
-        # Check log file
-        assert control.log_file.exists() or len(control.action_history) > 0
+        assert control.action_history[-1].action_type == "volume"
+        assert "volume" in log_file.read_text()
 
     def test_get_recent_actions(self, control):
         """Test getting recent actions."""
@@ -249,143 +205,108 @@ class TestControlQueryHandler:
     """Tests for ControlQueryHandler class."""
 
     @pytest.fixture
-    def handler(self):
+    def handler(self, control):
         """Create a control query handler."""
-        with tempfile.NamedTemporaryFile(suffix='.log', delete=False) as f:
-            log_path = f.name
-
-        from modules.system_control import SystemControl, ControlQueryHandler
-        control = SystemControl(log_file=log_path)
-        handler = ControlQueryHandler(control)
-
-        yield handler
+        return ControlQueryHandler(control)
 
-        if os.path.exists(log_path):
-            os.unlink(log_path)
-
-    def test_open_command_patterns(self, handler):
+    @pytest.fixture
+    def mocked_action(self, handler, monkeypatch):
+        """Stub a control method with a successful ActionResult."""
+        def _mock(method, message):
+            result = ActionResult(success=True, message=message, action_type=method)
+            # No call assertions on these stubs, so skip MagicMock's call recording
+            monkeypatch.setattr(handler.control, method, lambda *args, **kwargs: result)
+        return _mock
+
+    @pytest.mark.parametrize("cmd", [
+        "abre firefox",
+        "abre el terminal",
+        "abrir la terminal",
+        "ejecuta spotify",
+        "lanza chrome",
+    ])
+    def test_open_command_patterns(self, handler, patched_subprocess, cmd):
         """Test open command recognition."""
-        commands = [
-            "abre firefox",
-            "abre el terminal",
-            "abrir la terminal",
-            "ejecuta spotify",
-            "lanza chrome",
-        ]
-
-        for cmd in commands:
-            is_cmd, response = handler.process_command(cmd)
-            assert is_cmd, f"Should recognize: {cmd}"
-
-    def test_close_command_patterns(self, handler):
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
+
+    @pytest.mark.parametrize("cmd", [
+        "cierra firefox",
+        "cierra el reproductor",
+        "cerrar spotify",
+        "termina chrome",
+    ])
+    def test_close_command_patterns(self, handler, patched_subprocess, cmd):
         """Test close command recognition."""
-        commands = [
-            "cierra firefox",
-            "cierra el reproductor",
-            "cerrar spotify",
-            "termina chrome",
-        ]
-
-        for cmd in commands:
-            is_cmd, response = handler.process_command(cmd)
-            assert is_cmd, f"Should recognize: {cmd}"
-
-    def test_volume_up_command(self, handler):
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
+
+    @pytest.mark.parametrize("cmd", [
+        "sube el volumen",
+        "sube volumen",
+        "más volumen",
+    ])
+    def test_volume_up_command(self, handler, mocked_action, cmd):
         """Test volume up command."""
-        from modules.system_control import ActionResult
-
-        commands = [
-            "sube el volumen",
-            "sube volumen",
-            "más volumen",
-        ]
+        mocked_action("change_volume", "Volumen subido.")
 
-        with patch.object(handler.control, 'change_volume') as mock_volume:
-            mock_volume.return_value = ActionResult(
-                success=True, message="Volumen subido.", action_type="volume"
-            )
-            for cmd in commands:
-                is_cmd, response = handler.process_command(cmd)
-                assert is_cmd, f"Should recognize: {cmd}"
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
 
-    def test_volume_down_command(self, handler):
+    @pytest.mark.parametrize("cmd", [
+        "baja el volumen",
+        "baja volumen",
+        "menos volumen",
+    ])
+    def test_volume_down_command(self, handler, mocked_action, cmd):
         """Test volume down command."""
-        from modules.system_control import ActionResult
-
-        commands = [
-            "baja el volumen",
-            "baja volumen",
-            "menos volumen",
-        ]
+        mocked_action("change_volume", "Volumen bajado.")
 
-        with patch.object(handler.control, 'change_volume') as mock_volume:
-            mock_volume.return_value = ActionResult(
-                success=True, message="Volumen bajado.", action_type="volume"
-            )
-            for cmd in commands:
-                is_cmd, response = handler.process_command(cmd)
-                assert is_cmd, f"Should recognize: {cmd}"
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
 
-    def test_mute_command(self, handler):
+    def test_mute_command(self, handler, mocked_action):
         """Test mute command."""
-        from modules.system_control import ActionResult
+        mocked_action("mute", "Audio silenciado.")
 
-        with patch.object(handler.control, 'mute') as mock_mute:
-            mock_mute.return_value = ActionResult(
-                success=True, message="Audio silenciado.", action_type="volume"
-            )
-            is_cmd, response = handler.process_command("silencia")
-            assert is_cmd
-            assert response is not None
-
-    def test_set_volume_command(self, handler):
+        is_cmd, response = handler.process_command("silencia")
+        assert is_cmd
+        assert response is not None
+
+    @pytest.mark.parametrize("cmd", [
+        "volumen al 50",
+        "pon el volumen a 50",
+        "pon volumen al 50",
+    ])
+    def test_set_volume_command(self, handler, mocked_action, cmd):
         """Test set volume command."""
-        from modules.system_control import ActionResult
-
-        commands = [
-            "volumen al 50",
-            "pon el volumen a 50",
-            "pon volumen al 50",
-        ]
-
-        with patch.object(handler.control, 'set_volume') as mock_volume:
-            mock_volume.return_value = ActionResult(
-                success=True, message="Volumen al 50%.", action_type="volume"
-            )
-            for cmd in commands:
-                is_cmd, response = handler.process_command(cmd)
-                assert is_cmd, f"Should recognize: {cmd}"
-
-    def test_brightness_commands(self, handler):
+        mocked_action("set_volume", "Volumen al 50%.")
+
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
+
+    @pytest.mark.parametrize("cmd", [
+        "sube el brillo",
+        "baja el brillo",
+        "más brillo",
+        "menos brillo",
+    ])
+    def test_brightness_commands(self, handler, mocked_action, cmd):
         """Test brightness commands."""
-        from modules.system_control import ActionResult
-
-        commands = [
-            "sube el brillo",
-            "baja el brillo",
-            "más brillo",
-            "menos brillo",
-        ]
+        mocked_action("change_brightness", "Brillo ajustado.")
 
-        with patch.object(handler.control, 'change_brightness') as mock_brightness:
-            mock_brightness.return_value = ActionResult(
-                success=True, message="Brillo ajustado.", action_type="brightness"
-            )
-            for cmd in commands:
-                is_cmd, response = handler.process_command(cmd)
-                assert is_cmd, f"Should recognize: {cmd}"
+        is_cmd, response = handler.process_command(cmd)
+        assert is_cmd, f"Should recognize: {cmd}"
 
-    def test_non_control_command(self, handler):
+    @pytest.mark.parametrize("cmd", [
+        "qué hora es",
+        "cuéntame un chiste",
+        "cómo está el sistema",
+    ])
+    def test_non_control_command(self, handler, cmd):
         """Test non-control commands pass through."""
-        commands = [
-            "qué hora es",
-            "cuéntame un chiste",
-            "cómo está el sistema",
-        ]
-
-        for cmd in commands:
-            is_cmd, response = handler.process_command(cmd)
-            assert not is_cmd, f"Should not recognize: {cmd}"
+        is_cmd, response = handler.process_command(cmd)
+        assert not is_cmd, f"Should not recognize: {cmd}"
 
     def test_confirmation_responses(self, handler):
         """Test confirmation responses."""
@@ -406,8 +327,6 @@ class TestActionResult:
 
     def test_action_result_creation(self):
         """Test creating action result."""
-        from modules.system_control import ActionResult
-
         result = ActionResult(
             success=True,
             message="Test message",
@@ -420,8 +339,6 @@ class TestActionResult:
 
     def test_action_result_with_confirmation(self):
         """Test action result requiring confirmation."""
-        from modules.system_control import ActionResult
-
         result = ActionResult(
             success=False,
             message="Needs confirmation",
@@ -438,35 +355,29 @@ class TestActionRisk:
 
     def test_risk_levels(self):
         """Test risk level values."""
-        from modules.system_control import ActionRisk
-
         assert ActionRisk.SAFE.value == "safe"
         assert ActionRisk.MODERATE.value == "moderate"
         assert ActionRisk.DANGEROUS.value == "dangerous"
         assert ActionRisk.FORBIDDEN.value == "forbidden"
 
 
+@pytest.mark.serial
 class TestSingletons:
     """Tests for singleton functions."""
 
-    def test_get_system_control(self):
-        """Test get_system_control returns instance."""
-        from modules import system_control as sc
-
-        # Reset singleton
-        sc._control_instance = None
+    @pytest.fixture
+    def reset_singletons(self, monkeypatch):
+        """Reset module singletons (restored by monkeypatch after the test)."""
+        monkeypatch.setattr(sc, '_control_instance', None)
+        monkeypatch.setattr(sc, '_handler_instance', None)
 
+    def test_get_system_control(self, reset_singletons):
+        """Test get_system_control returns instance."""
         control = sc.get_system_control()
         assert control is not None
 
-    def test_get_control_handler(self):
+    def test_get_control_handler(self, reset_singletons):
         """Test get_control_handler returns instance."""
-        from modules import system_control as sc
-
-        # Reset singletons
-        sc._control_instance = None
-        sc._handler_instance = None
-
         handler = sc.get_control_handler()
         assert handler is not None
 
@@ -476,8 +387,6 @@ class TestAppAliases:
 
     def test_common_app_aliases_exist(self):
         """Test common app aliases are defined."""
-        from modules.system_control import SystemControl
-
         common_apps = [
             "firefox", "terminal", "archivos", "editor",
             "navegador", "spotify", "vlc"
@@ -3,25 +3,32 @@ Tests for JARVIS System Monitor module.
 """
 
 import pytest
-import time
+import socket
+import threading
 from unittest.mock import patch, MagicMock
 
+from modules import system_monitor as sm
+from modules.system_monitor import (
+    AlertThresholds, ProcessInfo, SystemMonitor, SystemQueryHandler, SystemStatus
+)
+
+
+@pytest.fixture(scope="module")
+def monitor():
+    """Shared monitor for tests that only read system state."""
+    return SystemMonitor()
+
 
 class TestSystemMonitor:
     """Tests for SystemMonitor class."""
 
-    def test_initialization(self):
+    def test_initialization(self, monitor):
         """Test monitor initialization."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         assert monitor.thresholds is not None
         assert monitor.check_interval == 30.0
 
     def test_initialization_with_custom_thresholds(self):
         """Test monitor with custom thresholds."""
-        from modules.system_monitor import SystemMonitor, AlertThresholds
-
         thresholds = AlertThresholds(
             cpu_percent=80.0,
             ram_percent=70.0,
@@ -32,11 +39,8 @@ class TestSystemMonitor:
         assert monitor.thresholds.cpu_percent == 80.0
         assert monitor.thresholds.ram_percent == 70.0
 
-    def test_get_status(self):
+    def test_get_status(self, monitor):
         """Test getting system status."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         status = monitor.get_status()
 
         assert status.cpu_percent >= 0
@@ -46,11 +50,8 @@ class TestSystemMonitor:
         assert status.disk_total_gb > 0
         assert isinstance(status.network_connected, bool)
 
-    def test_get_status_report(self):
+    def test_get_status_report(self, monitor):
         """Test getting status report."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         report = monitor.get_status_report()
 
         assert len(report) > 0
@@ -58,61 +59,43 @@ class TestSystemMonitor:
         assert "RAM" in report
         assert "Disco" in report
 
-    def test_get_quick_status(self):
+    def test_get_quick_status(self, monitor):
         """Test getting quick status."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         status = monitor.get_quick_status()
 
         assert len(status) > 0
         # Should contain useful status info (percentage or temperature)
         assert "%" in status or "°C" in status or "internet" in status
 
-    def test_get_ram_info(self):
+    def test_get_ram_info(self, monitor):
         """Test getting RAM info."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         info = monitor.get_ram_info()
 
         assert "GB" in info
         assert "RAM" in info or "disponible" in info
 
-    def test_get_disk_info(self):
+    def test_get_disk_info(self, monitor):
         """Test getting disk info."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         info = monitor.get_disk_info()
 
         assert "GB" in info
         assert "disco" in info.lower()
 
-    def test_get_cpu_info(self):
+    def test_get_cpu_info(self, monitor):
         """Test getting CPU info."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         info = monitor.get_cpu_info()
 
         assert "CPU" in info
         assert "%" in info
 
-    def test_get_network_info(self):
+    def test_get_network_info(self, monitor):
         """Test getting network info."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         info = monitor.get_network_info()
 
         assert "conexión" in info.lower() or "internet" in info.lower()
 
-    def test_get_top_processes(self):
+    def test_get_top_processes(self, monitor):
         """Test getting top processes."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         procs = monitor.get_top_processes(limit=5)
 
         assert len(procs) <= 5
@@ -120,33 +103,30 @@ class TestSystemMonitor:
             assert procs[0].pid > 0
             assert procs[0].name is not None
 
-    def test_get_top_processes_by_memory(self):
+    def test_get_top_processes_by_memory(self, monitor):
         """Test getting top processes by memory."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         procs = monitor.get_top_processes(by="memory", limit=3)
 
         assert len(procs) <= 3
 
-    def test_start_stop_monitoring(self):
+    def test_start_stop_monitoring(self, monkeypatch):
         """Test starting and stopping background monitoring."""
-        from modules.system_monitor import SystemMonitor
-
         monitor = SystemMonitor(check_interval=0.1)
+        checked = threading.Event()
+        monkeypatch.setattr(monitor, '_check_for_alerts', checked.set)
 
         monitor.start_monitoring()
         assert monitor._running
 
-        time.sleep(0.2)
+        # Wait for the loop's first check instead of sleeping a fixed time
+        assert checked.wait(timeout=1.0)
 
         monitor.stop_monitoring()
         assert not monitor._running
+        assert not monitor._monitor_thread.is_alive()
 
     def test_alert_callback(self):
         """Test alert callback is called."""
-        from modules.system_monitor import SystemMonitor, AlertThresholds
-
         alerts = []
 
         def on_alert(msg):
@@ -173,7 +153,6 @@ class TestSystemMonitor:
 
     def test_alert_cooldown(self):
         """Test alert cooldown prevents spam."""
-        from modules.system_monitor import SystemMonitor, AlertThresholds
         from datetime import timedelta
 
         alerts = []
@@ -198,160 +177,109 @@ class TestSystemMonitor:
 class TestSystemQueryHandler:
     """Tests for SystemQueryHandler class."""
 
+    @pytest.fixture(scope="module")
+    def handler(self, monitor):
+        """Query handler over the shared monitor."""
+        return SystemQueryHandler(monitor)
+
     def test_initialization(self):
         """Test query handler initialization."""
-        from modules.system_monitor import SystemQueryHandler
-
         handler = SystemQueryHandler()
         assert handler.monitor is not None
 
-    def test_system_status_query(self):
+    @pytest.mark.parametrize("query", [
+        "cómo está el sistema",
+        "como esta el sistema",
+        "estado del sistema",
+        "reporte del sistema",
+    ])
+    def test_system_status_query(self, handler, query):
         """Test system status query."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "cómo está el sistema",
-            "como esta el sistema",
-            "estado del sistema",
-            "reporte del sistema",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-            assert response is not None
-
-    def test_ram_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+        assert response is not None
+
+    @pytest.mark.parametrize("query", [
+        "cuánta RAM libre tengo",
+        "cuanta ram disponible",
+        "memoria RAM",
+        "uso de memoria",
+    ])
+    def test_ram_query(self, handler, query):
         """Test RAM queries."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "cuánta RAM libre tengo",
-            "cuanta ram disponible",
-            "memoria RAM",
-            "uso de memoria",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-            assert "GB" in response
-
-    def test_disk_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+        assert "GB" in response
+
+    @pytest.mark.parametrize("query", [
+        "cuánto disco libre",
+        "espacio en disco",
+        "almacenamiento",
+    ])
+    def test_disk_query(self, handler, query):
         """Test disk queries."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "cuánto disco libre",
-            "espacio en disco",
-            "almacenamiento",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-            assert "GB" in response or "disco" in response.lower()
-
-    def test_cpu_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+        assert "GB" in response or "disco" in response.lower()
+
+    @pytest.mark.parametrize("query", [
+        "cómo está el CPU",
+        "uso del cpu",
+        "procesador",
+    ])
+    def test_cpu_query(self, handler, query):
         """Test CPU queries."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "cómo está el CPU",
-            "uso del cpu",
-            "procesador",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-            assert "CPU" in response or "%" in response
-
-    def test_network_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+        assert "CPU" in response or "%" in response
+
+    @pytest.mark.parametrize("query", [
+        "hay internet",
+        "conexión a internet",
+        "está conectado",
+    ])
+    def test_network_query(self, handler, query):
         """Test network queries."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "hay internet",
-            "conexión a internet",
-            "está conectado",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-            assert "conexión" in response.lower() or "internet" in response.lower()
-
-    def test_processes_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+        assert "conexión" in response.lower() or "internet" in response.lower()
+
+    @pytest.mark.parametrize("query", [
+        "qué procesos",
+        "qué está consumiendo",
+    ])
+    def test_processes_query(self, handler, query):
         """Test processes query."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "qué procesos",
-            "qué está consumiendo",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert is_query, f"Should recognize: {query}"
-
-    def test_non_system_query(self):
+        is_query, response = handler.process_query(query)
+        assert is_query, f"Should recognize: {query}"
+
+    @pytest.mark.parametrize("query", [
+        "qué hora es",
+        "cuéntame un chiste",
+        "hola jarvis",
+    ])
+    def test_non_system_query(self, handler, query):
         """Test non-system queries pass through."""
-        from modules.system_monitor import SystemQueryHandler
-
-        handler = SystemQueryHandler()
-
-        queries = [
-            "qué hora es",
-            "cuéntame un chiste",
-            "hola jarvis",
-        ]
-
-        for query in queries:
-            is_query, response = handler.process_query(query)
-            assert not is_query, f"Should not recognize: {query}"
-            assert response is None
+        is_query, response = handler.process_query(query)
+        assert not is_query, f"Should not recognize: {query}"
+        assert response is None
 
 
 class TestAlertThresholds:
     """Tests for AlertThresholds dataclass."""
 
-    def test_default_thresholds(self):
-        """Test default threshold values."""
-        from modules.system_monitor import AlertThresholds
-
-        thresholds = AlertThresholds()
+    @pytest.mark.parametrize("kwargs,expected", [
+        ({}, {"cpu_percent": 90.0, "ram_percent": 85.0,
+              "disk_percent": 90.0, "temperature_celsius": 80.0}),
+        ({"cpu_percent": 75.0, "ram_percent": 80.0, "disk_percent": 95.0},
+         {"cpu_percent": 75.0, "ram_percent": 80.0, "disk_percent": 95.0}),
+    ], ids=["default", "custom"])
+    def test_thresholds(self, kwargs, expected):
+        """Test default and custom threshold values."""
+        thresholds = AlertThresholds(**kwargs)
 
-        assert thresholds.cpu_percent == 90.0
-        assert thresholds.ram_percent == 85.0
-        assert thresholds.disk_percent == 90.0
-        assert thresholds.temperature_celsius == 80.0
-
-    def test_custom_thresholds(self):
-        """Test custom threshold values."""
-        from modules.system_monitor import AlertThresholds
-
-        thresholds = AlertThresholds(
-            cpu_percent=75.0,
-            ram_percent=80.0,
-            disk_percent=95.0
-        )
-
-        assert thresholds.cpu_percent == 75.0
-        assert thresholds.ram_percent == 80.0
-        assert thresholds.disk_percent == 95.0
+        for field_name, value in expected.items():
+            assert getattr(thresholds, field_name) == value
 
 
 class TestSystemStatus:
@@ -359,8 +287,6 @@ class TestSystemStatus:
 
     def test_status_creation(self):
         """Test creating a status object."""
-        from modules.system_monitor import SystemStatus
-
         status = SystemStatus(
             cpu_percent=50.0,
             cpu_count=8,
@@ -387,8 +313,6 @@ class TestProcessInfo:
 
     def test_process_info_creation(self):
         """Test creating a process info object."""
-        from modules.system_monitor import ProcessInfo
-
         proc = ProcessInfo(
             pid=1234,
             name="python",
@@ -403,27 +327,23 @@ class TestProcessInfo:
         assert proc.cpu_percent == 10.5
 
 
+@pytest.mark.serial
 class TestSingletons:
     """Tests for singleton functions."""
 
-    def test_get_system_monitor(self):
-        """Test get_system_monitor returns instance."""
-        from modules import system_monitor as sm
-
-        # Reset singleton
-        sm._monitor_instance = None
+    @pytest.fixture
+    def reset_singletons(self, monkeypatch):
+        """Reset module singletons (restored by monkeypatch after the test)."""
+        monkeypatch.setattr(sm, '_monitor_instance', None)
+        monkeypatch.setattr(sm, '_query_handler_instance', None)
 
+    def test_get_system_monitor(self, reset_singletons):
+        """Test get_system_monitor returns instance."""
         monitor = sm.get_system_monitor()
         assert monitor is not None
 
-    def test_get_query_handler(self):
+    def test_get_query_handler(self, reset_singletons):
         """Test get_query_handler returns instance."""
-        from modules import system_monitor as sm
-
-        # Reset singletons
-        sm._monitor_instance = None
-        sm._query_handler_instance = None
-
         handler = sm.get_query_handler()
         assert handler is not None
 
@@ -431,36 +351,29 @@ class TestSingletons:
 class TestInternetCheck:
     """Tests for internet connectivity check."""
 
-    def test_check_internet_with_connection(self):
-        """Test internet check when connected."""
-        from modules.system_monitor import SystemMonitor
+    @pytest.fixture
+    def mock_socket(self, monkeypatch):
+        """Stub socket.create_connection so no test touches the network."""
+        mock = MagicMock()
+        monkeypatch.setattr(sm.socket, 'create_connection', mock)
+        return mock
 
-        monitor = SystemMonitor()
-        # This test assumes the machine has internet
-        # In CI without internet, this would fail
+    def test_check_internet_with_connection(self, mock_socket, monitor):
+        """Test internet check when connected."""
         result = monitor._check_internet(timeout=1.0)
-        assert isinstance(result, bool)
+        assert result is True
 
-    @patch('socket.create_connection')
-    def test_check_internet_timeout(self, mock_socket):
+    def test_check_internet_timeout(self, mock_socket, monitor):
         """Test internet check handles timeout."""
-        from modules.system_monitor import SystemMonitor
-        import socket
-
         mock_socket.side_effect = socket.timeout()
 
-        monitor = SystemMonitor()
         result = monitor._check_internet(timeout=0.1)
         assert result is False
 
-    @patch('socket.create_connection')
-    def test_check_internet_no_connection(self, mock_socket):
+    def test_check_internet_no_connection(self, mock_socket, monitor):
         """Test internet check when disconnected."""
-        from modules.system_monitor import SystemMonitor
-
         mock_socket.side_effect = OSError()
 
-        monitor = SystemMonitor()
         result = monitor._check_internet()
         assert result is False
 
@@ -468,28 +381,22 @@ class TestInternetCheck:
 class TestTemperatureReading:
     """Tests for temperature reading."""
 
-    def test_get_temperatures(self):
+    def test_get_temperatures(self, monitor):
         """Test temperature reading."""
-        from modules.system_monitor import SystemMonitor
-
-        monitor = SystemMonitor()
         temps = monitor._get_temperatures()
 
         # Temperatures might be empty on some systems
         assert isinstance(temps, dict)
 
     @patch('psutil.sensors_temperatures')
-    def test_get_temperatures_with_sensors(self, mock_temps):
+    def test_get_temperatures_with_sensors(self, mock_temps, monitor):
         """Test temperature reading with mock sensors."""
-        from modules.system_monitor import SystemMonitor
-
         mock_entry = MagicMock()
         mock_entry.label = "CPU"
         mock_entry.current = 55.0
 
         mock_temps.return_value = {"coretemp": [mock_entry]}
 
-        monitor = SystemMonitor()
         temps = monitor._get_temperatures()
 
         assert "CPU" in temps
@@ -3,9 +3,36 @@ Tests for Text-to-Speech module.
 """
 
 import pytest
-from pathlib import Path
 from unittest.mock import MagicMock, patch
-import numpy as np
+
+
+@pytest.fixture(scope="module")
+def piper_model_file(models_dir):
+    """Resolve the Piper voice file once; skip when the model or Piper is missing."""
+    # Check the file first so a missing model skips before importing piper/onnxruntime
+    model_path = models_dir / "es_ES-davefx-medium.onnx"
+    if not model_path.exists():
+        pytest.skip("Piper model not downloaded")
+
+    from modules.tts import PIPER_AVAILABLE
+
+    if not PIPER_AVAILABLE:
+        pytest.skip("Piper not available")
+    return str(model_path)
+
+
+@pytest.fixture(scope="module")
+def piper_voice(piper_model_file):
+    """Load the Piper voice once for the module."""
+    from piper import PiperVoice
+    return PiperVoice.load(piper_model_file, config_path=piper_model_file + ".json")
+
+
+@pytest.fixture
+def piper_model_path(piper_model_file, piper_voice, monkeypatch):
+    """Model path whose TextToSpeech construction reuses the module voice."""
+    monkeypatch.setattr("modules.tts.PiperVoice.load", lambda *args, **kwargs: piper_voice)
+    return piper_model_file
 
 
 class TestTextToSpeech:
@@ -21,79 +48,50 @@ class TestTextToSpeech:
         with pytest.raises(FileNotFoundError):
             TextToSpeech(model_path="/nonexistent/path")
 
-    def test_fallback_to_espeak_when_piper_unavailable(self):
+    def test_fallback_to_espeak_when_piper_unavailable(self, monkeypatch):
         """Test that espeak fallback is used when Piper not available."""
         from modules import tts
 
-        # Temporarily disable Piper
-        original_available = tts.PIPER_AVAILABLE
-        tts.PIPER_AVAILABLE = False
+        monkeypatch.setattr(tts, 'PIPER_AVAILABLE', False)
 
-        try:
-            tts_instance = tts.TextToSpeech(model_path="/any/path")
-            assert tts_instance.voice is None
-            assert tts_instance.sample_rate == 22050
-        finally:
-            tts.PIPER_AVAILABLE = original_available
+        tts_instance = tts.TextToSpeech(model_path="/any/path")
+        assert tts_instance.voice is None
+        assert tts_instance.sample_rate == 22050
 
-    def test_model_loads_successfully(self, models_dir):
+    @pytest.mark.slow
+    def test_model_loads_successfully(self, piper_model_path):
         """Test that Piper model loads correctly."""
-        from modules.tts import TextToSpeech, PIPER_AVAILABLE
+        from modules.tts import TextToSpeech
 
-        if not PIPER_AVAILABLE:
-            pytest.skip("Piper not available")
-
-        model_path = models_dir / "es_ES-davefx-medium.onnx"
-        if not model_path.exists():
-            pytest.skip("Piper model not downloaded")
-
-        tts = TextToSpeech(model_path=str(model_path))
+        tts = TextToSpeech(model_path=piper_model_path)
         assert tts.voice is not None
 
-    def test_stop_sets_flags(self, models_dir):
+    @pytest.mark.slow
+    def test_stop_sets_flags(self, piper_model_path):
         """Test that stop() sets flags correctly."""
-        from modules.tts import TextToSpeech, PIPER_AVAILABLE
-
-        if not PIPER_AVAILABLE:
-            pytest.skip("Piper not available")
+        from modules.tts import TextToSpeech
 
-        model_path = models_dir / "es_ES-davefx-medium.onnx"
-        if not model_path.exists():
-            pytest.skip("Piper model not downloaded")
-
-        tts = TextToSpeech(model_path=str(model_path))
+        tts = TextToSpeech(model_path=piper_model_path)
         tts.stop()
 
         assert tts._stop_requested is True
 
-    def test_speak_empty_text_returns_true(self, models_dir):
+    @pytest.mark.slow
+    def test_speak_empty_text_returns_true(self, piper_model_path):
         """Test that speaking empty text returns True immediately."""
-        from modules.tts import TextToSpeech, PIPER_AVAILABLE
-
-        if not PIPER_AVAILABLE:
-            pytest.skip("Piper not available")
+        from modules.tts import TextToSpeech
 
-        model_path = models_dir / "es_ES-davefx-medium.onnx"
-        if not model_path.exists():
-            pytest.skip("Piper model not downloaded")
-
-        tts = TextToSpeech(model_path=str(model_path))
+        tts = TextToSpeech(model_path=piper_model_path)
         result = tts.speak("")
 
         assert result is True
 
-    def test_speak_with_interruption(self, models_dir):
+    @pytest.mark.slow
+    def test_speak_with_interruption(self, piper_model_path):
         """Test that speech can be interrupted."""
-        from modules.tts import TextToSpeech, PIPER_AVAILABLE
+        from modules.tts import TextToSpeech
 
-        if not PIPER_AVAILABLE:
-            pytest.skip("Piper not available")
-
-        model_path = models_dir / "es_ES-davefx-medium.onnx"
-        if not model_path.exists():
-            pytest.skip("Piper model not downloaded")
-
-        tts = TextToSpeech(model_path=str(model_path))
+        tts = TextToSpeech(model_path=piper_model_path)
 
         # Pre-set stop flag
         tts._stop_requested = True
@@ -101,41 +99,30 @@ class TestTextToSpeech:
 
         assert result is False
 
-    def test_espeak_fallback(self):
+    def test_espeak_fallback(self, monkeypatch):
         """Test espeak fallback method."""
         from modules import tts
 
-        original_available = tts.PIPER_AVAILABLE
-        tts.PIPER_AVAILABLE = False
+        monkeypatch.setattr(tts, 'PIPER_AVAILABLE', False)
+        tts_instance = tts.TextToSpeech(model_path="/any/path")
 
-        try:
-            tts_instance = tts.TextToSpeech(model_path="/any/path")
+        with patch('subprocess.Popen') as mock_popen:
+            mock_process = MagicMock()
+            mock_process.poll.return_value = 0
+            mock_process.returncode = 0
+            mock_popen.return_value = mock_process
 
-            with patch('subprocess.Popen') as mock_popen:
-                mock_process = MagicMock()
-                mock_process.poll.return_value = 0
-                mock_process.returncode = 0
-                mock_popen.return_value = mock_process
+            result = tts_instance._speak_espeak("Hola")
+            assert result is True
+            mock_popen.assert_called_once()
 
-                result = tts_instance._speak_espeak("Hola")
-                assert result is True
-                mock_popen.assert_called_once()
-        finally:
-            tts.PIPER_AVAILABLE = original_available
-
-    def test_configuration_parameters(self, models_dir):
+    @pytest.mark.slow
+    def test_configuration_parameters(self, piper_model_path):
         """Test that configuration parameters are set correctly."""
-        from modules.tts import TextToSpeech, PIPER_AVAILABLE
-
-        if not PIPER_AVAILABLE:
-            pytest.skip("Piper not available")
-
-        model_path = models_dir / "es_ES-davefx-medium.onnx"
-        if not model_path.exists():
-            pytest.skip("Piper model not downloaded")
+        from modules.tts import TextToSpeech
 
         tts = TextToSpeech(
-            model_path=str(model_path),
+            model_path=piper_model_path,
             speed=1.5,
             speaker_id=1
         )
@@ -4,50 +4,44 @@ Prueba selección de modelos por calidad y descarga automática.
 """
 
 import pytest
-import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-sys.path.insert(0, '/home/andres/Desarrollo/IA/Jarvis')
-
 from ui.tts_engine import TTSEngine
 
 
-class TestTTSModelQuality:
-    """Tests de priorización de calidad de modelos."""
+@pytest.fixture(scope="module")
+def tts():
+    """Instancia compartida para tests que solo leen el motor."""
+    return TTSEngine(backend="espeak")
 
-    def test_get_model_quality_low(self):
-        """Test detección de calidad low."""
-        tts = TTSEngine(backend="espeak")
-        assert tts._get_model_quality("es_MX-claude-low.onnx") == "low"
 
-    def test_get_model_quality_x_low(self):
-        """Test detección de calidad x_low."""
-        tts = TTSEngine(backend="espeak")
-        assert tts._get_model_quality("es_MX-claude-x_low.onnx") == "x_low"
+@pytest.fixture
+def fresh_tts():
+    """Instancia propia para tests que cambian voz o rutas de modelos."""
+    return TTSEngine(backend="espeak")
 
-    def test_get_model_quality_medium(self):
-        """Test detección de calidad medium."""
-        tts = TTSEngine(backend="espeak")
-        assert tts._get_model_quality("es_ES-davefx-medium.onnx") == "medium"
 
-    def test_get_model_quality_high(self):
-        """Test detección de calidad high."""
-        tts = TTSEngine(backend="espeak")
-        assert tts._get_model_quality("voice-high.onnx") == "high"
+class TestTTSModelQuality:
+    """Tests de priorización de calidad de modelos."""
 
-    def test_get_model_quality_unknown(self):
-        """Test calidad desconocida."""
-        tts = TTSEngine(backend="espeak")
-        assert tts._get_model_quality("random-model.onnx") == "unknown"
+    @pytest.mark.parametrize("name,expected", [
+        ("es_MX-claude-low.onnx", "low"),
+        ("es_MX-claude-x_low.onnx", "x_low"),
+        ("es_ES-davefx-medium.onnx", "medium"),
+        ("voice-high.onnx", "high"),
+        ("random-model.onnx", "unknown"),
+    ])
+    def test_get_model_quality(self, tts, name, expected):
+        """Test detección de calidad por nombre de modelo."""
+        assert tts._get_model_quality(name) == expected
 
 
 class TestTTSModelPriority:
     """Tests de prioridad de modelos."""
 
-    def test_priority_order(self):
+    def test_priority_order(self, tts):
         """Test orden de prioridad correcto."""
-        tts = TTSEngine(backend="espeak")
         priorities = tts.MODEL_QUALITY_PRIORITY
 
         assert priorities["high"] > priorities["medium"]
@@ -58,21 +52,18 @@ class TestTTSModelPriority:
 class TestTTSModelDownload:
     """Tests de descarga de modelos."""
 
-    def test_download_model_invalid_name(self):
+    def test_download_model_invalid_name(self, tts):
         """Test descarga con nombre inválido."""
-        tts = TTSEngine(backend="espeak")
         result = tts.download_piper_model("modelo-inexistente")
         assert result == False
 
-    def test_download_model_urls_exist(self):
+    def test_download_model_urls_exist(self, tts):
         """Test que las URLs de descarga están configuradas."""
-        tts = TTSEngine(backend="espeak")
         assert "es_MX-claude-low" in tts.PIPER_MODEL_URLS
         assert "es_MX-claude-x_low" in tts.PIPER_MODEL_URLS
 
-    def test_model_info_has_required_fields(self):
+    def test_model_info_has_required_fields(self, tts):
         """Test que la info del modelo tiene campos requeridos."""
-        tts = TTSEngine(backend="espeak")
         for name, info in tts.PIPER_MODEL_URLS.items():
             assert "onnx" in info
             assert "json" in info
@@ -83,9 +74,8 @@ class TestTTSModelDownload:
 class TestTTSAvailableModels:
     """Tests de consulta de modelos disponibles."""
 
-    def test_get_available_models_structure(self):
+    def test_get_available_models_structure(self, tts):
         """Test estructura de respuesta."""
-        tts = TTSEngine(backend="espeak")
         models = tts.get_available_models()
 
         assert "installed" in models
@@ -94,9 +84,8 @@ class TestTTSAvailableModels:
         assert isinstance(models["installed"], list)
         assert isinstance(models["downloadable"], list)
 
-    def test_downloadable_includes_known_models(self):
+    def test_downloadable_includes_known_models(self, tts):
         """Test que modelos conocidos están en descargables."""
-        tts = TTSEngine(backend="espeak")
         models = tts.get_available_models()
 
         assert "es_MX-claude-low" in models["downloadable"]
@@ -106,9 +95,8 @@ class TestTTSAvailableModels:
 class TestTTSBackendInfo:
     """Tests de información del backend."""
 
-    def test_backend_info_espeak(self):
+    def test_backend_info_espeak(self, tts):
         """Test info con backend espeak."""
-        tts = TTSEngine(backend="espeak")
         info = tts.get_backend_info()
 
         assert info["backend"] == "espeak"
@@ -130,34 +118,30 @@ class TestTTSBackendInfo:
 class TestTTSCleanText:
     """Tests de limpieza de texto para síntesis."""
 
-    def test_clean_removes_emojis(self):
+    def test_clean_removes_emojis(self, tts):
         """Test que remueve emojis."""
-        tts = TTSEngine(backend="espeak")
         result = tts._clean_for_speech("Hola 😀 mundo 🎉")
         assert "😀" not in result
         assert "🎉" not in result
         assert "Hola" in result
         assert "mundo" in result
 
-    def test_clean_removes_urls(self):
+    def test_clean_removes_urls(self, tts):
         """Test que remueve URLs."""
-        tts = TTSEngine(backend="espeak")
         result = tts._clean_for_speech("Visita https://example.com para más")
         assert "https" not in result
         assert "example.com" not in result
 
-    def test_clean_removes_markdown(self):
+    def test_clean_removes_markdown(self, tts):
         """Test que remueve formato markdown."""
-        tts = TTSEngine(backend="espeak")
         result = tts._clean_for_speech("Texto **negrita** y *cursiva*")
         assert "**" not in result
         assert "*" not in result
         assert "negrita" in result
         assert "cursiva" in result
 
-    def test_clean_normalizes_whitespace(self):
+    def test_clean_normalizes_whitespace(self, tts):
         """Test que normaliza espacios."""
-        tts = TTSEngine(backend="espeak")
         result = tts._clean_for_speech("Hola    mundo   test")
         assert "    " not in result
         assert result == "Hola mundo test"
@@ -166,48 +150,33 @@ class TestTTSCleanText:
 class TestTTSVoiceSettings:
     """Tests de configuración de voz."""
 
-    def test_set_voice(self):
+    def test_set_voice(self, fresh_tts):
         """Test cambio de voz."""
-        tts = TTSEngine(backend="espeak")
-        tts.set_voice("en")
-        assert tts.espeak_voice == "en"
-
-    def test_set_speed_clamp_min(self):
-        """Test límite mínimo de velocidad."""
-        tts = TTSEngine(backend="espeak")
-        tts.set_speed(50)
-        assert tts.espeak_speed == 80
-
-    def test_set_speed_clamp_max(self):
-        """Test límite máximo de velocidad."""
-        tts = TTSEngine(backend="espeak")
-        tts.set_speed(500)
-        assert tts.espeak_speed == 450
-
-    def test_set_pitch_clamp_min(self):
-        """Test límite mínimo de tono."""
-        tts = TTSEngine(backend="espeak")
-        tts.set_pitch(-10)
-        assert tts.espeak_pitch == 0
-
-    def test_set_pitch_clamp_max(self):
-        """Test límite máximo de tono."""
-        tts = TTSEngine(backend="espeak")
-        tts.set_pitch(120)
-        assert tts.espeak_pitch == 99
+        fresh_tts.set_voice("en")
+        assert fresh_tts.espeak_voice == "en"
+
+    @pytest.mark.parametrize("value,expected", [(50, 80), (500, 450)])
+    def test_set_speed_clamp(self, fresh_tts, value, expected):
+        """Test límites mínimo y máximo de velocidad."""
+        fresh_tts.set_speed(value)
+        assert fresh_tts.espeak_speed == expected
+
+    @pytest.mark.parametrize("value,expected", [(-10, 0), (120, 99)])
+    def test_set_pitch_clamp(self, fresh_tts, value, expected):
+        """Test límites mínimo y máximo de tono."""
+        fresh_tts.set_pitch(value)
+        assert fresh_tts.espeak_pitch == expected
 
 
 class TestTTSState:
     """Tests de estado del TTS."""
 
-    def test_initial_not_speaking(self):
+    def test_initial_not_speaking(self, tts):
         """Test estado inicial."""
-        tts = TTSEngine(backend="espeak")
         assert not tts.is_speaking()
 
-    def test_stop_when_not_speaking(self):
+    def test_stop_when_not_speaking(self, tts):
         """Test stop cuando no está hablando."""
-        tts = TTSEngine(backend="espeak")
         # No debe fallar
         tts.stop()
         assert not tts.is_speaking()
@@ -216,30 +185,30 @@ class TestTTSState:
 class TestTTSFindModel:
     """Tests de búsqueda de modelos."""
 
-    def test_find_model_empty_dirs(self):
+    @pytest.fixture(scope="class")
+    def piper_models_dir(self, tmp_path_factory):
+        """Directorio con modelos simulados, creado una sola vez."""
+        models_dir = tmp_path_factory.mktemp("piper_models")
+        for name in ("es_MX-claude-low", "es_MX-claude-x_low"):
+            (models_dir / f"{name}.onnx").touch()
+            (models_dir / f"{name}.onnx.json").touch()
+        return models_dir
+
+    def test_find_model_empty_dirs(self, fresh_tts):
         """Test con directorios vacíos."""
-        tts = TTSEngine(backend="espeak")
         # Usar directorios que no existen
-        tts.PIPER_MODELS_DIR = Path("/nonexistent/path")
-        tts.PIPER_MODELS_DIR_USER = Path("/another/nonexistent")
+        fresh_tts.PIPER_MODELS_DIR = Path("/nonexistent/path")
+        fresh_tts.PIPER_MODELS_DIR_USER = Path("/another/nonexistent")
 
-        result = tts._find_piper_model()
+        result = fresh_tts._find_piper_model()
         assert result is None
 
-    def test_find_model_with_mocked_files(self, tmp_path):
+    def test_find_model_with_mocked_files(self, fresh_tts, piper_models_dir):
         """Test con archivos simulados."""
-        tts = TTSEngine(backend="espeak")
-
-        # Crear archivos de modelo simulados
-        (tmp_path / "es_MX-claude-low.onnx").touch()
-        (tmp_path / "es_MX-claude-low.onnx.json").touch()
-        (tmp_path / "es_MX-claude-x_low.onnx").touch()
-        (tmp_path / "es_MX-claude-x_low.onnx.json").touch()
-
-        tts.PIPER_MODELS_DIR = Path("/nonexistent")
-        tts.PIPER_MODELS_DIR_USER = tmp_path
+        fresh_tts.PIPER_MODELS_DIR = Path("/nonexistent")
+        fresh_tts.PIPER_MODELS_DIR_USER = piper_models_dir
 
-        result = tts._find_piper_model()
+        result = fresh_tts._find_piper_model()
         # Debe seleccionar low sobre x_low (low tiene mayor prioridad)
         assert result is not None
         assert "low" in result.name
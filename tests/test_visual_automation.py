@@ -5,14 +5,17 @@ Tests for JARVIS Visual Automation module.
 import pytest
 from unittest.mock import patch, MagicMock
 
+from modules import visual_automation
+from modules.visual_automation import (
+    AutomationStep, AutomationTask, TaskStatus, VisualAutomation, VisualAutomationHandler
+)
+
 
 class TestTaskStatus:
     """Tests for TaskStatus enum."""
 
     def test_status_values(self):
         """Test TaskStatus enum values."""
-        from modules.visual_automation import TaskStatus
-
         assert TaskStatus.PENDING.value == "pending"
         assert TaskStatus.EXECUTING.value == "executing"
         assert TaskStatus.COMPLETED.value == "completed"
@@ -24,8 +27,6 @@ class TestAutomationStep:
 
     def test_step_creation(self):
         """Test creating an automation step."""
-        from modules.visual_automation import AutomationStep
-
         step = AutomationStep(
             description="Test step",
             action_type="click",
@@ -43,8 +44,6 @@ class TestAutomationTask:
 
     def test_task_creation(self):
         """Test creating an automation task."""
-        from modules.visual_automation import AutomationTask, TaskStatus
-
         task = AutomationTask(description="Open browser and search")
 
         assert task.description == "Open browser and search"
@@ -56,14 +55,16 @@ class TestAutomationTask:
 class TestVisualAutomation:
     """Tests for VisualAutomation class."""
 
-    @pytest.fixture
-    def automation(self):
-        """Create a VisualAutomation instance."""
-        from modules.visual_automation import VisualAutomation
+    @pytest.fixture(scope="class")
+    def shared_automation(self):
+        """Create one VisualAutomation for the whole class."""
+        return VisualAutomation()
 
-        automation = VisualAutomation()
-        yield automation
-        automation.reset()
+    @pytest.fixture
+    def automation(self, shared_automation):
+        """Shared automation with its task state reset."""
+        shared_automation.reset()
+        return shared_automation
 
     def test_initialization(self, automation):
         """Test VisualAutomation initialization."""
@@ -72,8 +73,6 @@ class TestVisualAutomation:
 
     def test_cancel(self, automation):
         """Test cancelling automation."""
-        from modules.visual_automation import AutomationTask, TaskStatus
-
         automation.current_task = AutomationTask(description="test")
         automation.cancel()
 
@@ -126,8 +125,6 @@ class TestVisualAutomation:
 
     def test_execute_wait_step(self, automation):
         """Test executing a wait step."""
-        from modules.visual_automation import AutomationStep
-
         step = AutomationStep(
             description="Wait",
             action_type="wait",
@@ -139,8 +136,6 @@ class TestVisualAutomation:
 
     def test_execute_open_app_step(self, automation):
         """Test executing an open app step."""
-        from modules.visual_automation import AutomationStep
-
         step = AutomationStep(
             description="Open app",
             action_type="open_app",
@@ -153,8 +148,6 @@ class TestVisualAutomation:
 
     def test_execute_type_text_no_controller(self, automation):
         """Test typing without controller."""
-        from modules.visual_automation import AutomationStep
-
         step = AutomationStep(
             description="Type",
             action_type="type_text",
@@ -176,8 +169,6 @@ class TestVisualAutomationHandler:
     @pytest.fixture
     def handler(self):
         """Create a VisualAutomationHandler instance."""
-        from modules.visual_automation import VisualAutomationHandler
-
         handler = VisualAutomationHandler()
         yield handler
         handler.automation.reset()
@@ -187,20 +178,15 @@ class TestVisualAutomationHandler:
         assert handler.automation is not None
         assert not handler.awaiting_confirmation
 
-    def test_complex_task_query(self, handler):
+    @pytest.mark.parametrize("query", [
+        "abre chrome y busca el clima",
+        "haz la tarea: abrir archivos",
+    ])
+    def test_complex_task_query(self, handler, query):
         """Test complex task queries."""
-        queries = [
-            "abre chrome y busca el clima",
-            "haz la tarea: abrir archivos",
-        ]
-
-        for query in queries:
-            handler.awaiting_confirmation = False
-            handler.automation.reset()
-
-            is_handled, response = handler.process_query(query)
-            assert is_handled, f"Should handle: {query}"
-            assert "Plan para" in response or "Pasos" in response
+        is_handled, response = handler.process_query(query)
+        assert is_handled, f"Should handle: {query}"
+        assert "Plan para" in response or "Pasos" in response
 
     def test_confirmation_flow(self, handler):
         """Test confirmation flow."""
@@ -225,16 +211,14 @@ class TestVisualAutomationHandler:
         assert "cancelada" in response.lower()
         assert not handler.awaiting_confirmation
 
-    def test_non_automation_query(self, handler):
+    @pytest.mark.parametrize("query", [
+        "qué hora es",
+        "cuánta memoria hay",
+    ])
+    def test_non_automation_query(self, handler, query):
         """Test non-automation queries pass through."""
-        queries = [
-            "qué hora es",
-            "cuánta memoria hay",
-        ]
-
-        for query in queries:
-            is_handled, response = handler.process_query(query)
-            assert not is_handled, f"Should NOT handle: {query}"
+        is_handled, response = handler.process_query(query)
+        assert not is_handled, f"Should NOT handle: {query}"
 
 
 class TestSingletons:
@@ -242,8 +226,6 @@ class TestSingletons:
 
     def test_get_visual_automation(self):
         """Test get_visual_automation returns instance."""
-        from modules import visual_automation
-
         # Reset singleton
         visual_automation._automation_instance = None
 
@@ -252,8 +234,6 @@ class TestSingletons:
 
     def test_get_automation_handler(self):
         """Test get_automation_handler returns instance."""
-        from modules import visual_automation
-
         # Reset singletons
         visual_automation._automation_instance = None
         visual_automation._handler_instance = None
@@ -112,13 +112,47 @@ class TestWakeWordDetector:
         detector = WakeWordDetector()
 
         # Create mock audio data
-        mock_audio = np.zeros((1280, 1), dtype=np.float32)
+        mock_audio = np.zeros((1280, 1), dtype=np.int16)
 
         # Call callback
         detector._audio_callback(mock_audio, 1280, None, None)
 
         # Check that data was added to queue
-        assert not detector.audio_queue.empty()
+        assert len(detector.audio_queue) > 0
+
+    @pytest.fixture
+    def buffered_detector(self):
+        """Detector with only its audio buffers set up (no model needed)."""
+        from modules.wake_word import AUDIO_RING_SLOTS, CHUNK_SAMPLES, WakeWordDetector
+
+        detector = WakeWordDetector.__new__(WakeWordDetector)
+        detector._ring = np.empty((AUDIO_RING_SLOTS, CHUNK_SAMPLES), dtype=np.int16)
+        detector._reset_buffers()
+        return detector
+
+    def test_held_slot_not_overwritten(self, buffered_detector):
+        """Test a chunk being predicted is never reused by the callback."""
+        from modules.wake_word import AUDIO_RING_SLOTS, CHUNK_SAMPLES
+
+        detector = buffered_detector
+        chunk = np.full((CHUNK_SAMPLES, 1), 7, dtype=np.int16)
+        detector._audio_callback(chunk, CHUNK_SAMPLES, None, None)
+        held = detector.audio_queue.popleft()
+
+        # Overfill the queue while the consumer still holds its chunk
+        silence = np.zeros((CHUNK_SAMPLES, 1), dtype=np.int16)
+        for _ in range(3 * AUDIO_RING_SLOTS):
+            detector._audio_callback(silence, CHUNK_SAMPLES, None, None)
+
+        assert (held == 7).all()
+        assert len(detector.audio_queue) == AUDIO_RING_SLOTS - 1
+
+    def test_audio_callback_drops_odd_block_size(self, buffered_detector):
+        """Test blocks of an unexpected size are dropped instead of raising."""
+        detector = buffered_detector
+        detector._audio_callback(np.zeros((512, 1), dtype=np.int16), 512, None, None)
+
+        assert len(detector.audio_queue) == 0
 
 
 class TestCreateJarvisModel:
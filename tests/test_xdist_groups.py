@@ -0,0 +1,20 @@
+"""
+Tests for the xdist grouping set up in conftest.py.
+"""
+
+import pytest
+
+
+@pytest.mark.serial
+def test_serial_tests_share_one_group(request):
+    """Test every serial test is routed to the single "serial" xdist group."""
+    config = request.config
+    if not hasattr(config, "workerinput") or not getattr(config.option, "loadgroup", False):
+        pytest.skip("only meaningful on an xdist worker with --dist=loadgroup")
+
+    # loadgroup sends each "@group" suffix to exactly one worker
+    stray = [
+        item.nodeid for item in request.session.items
+        if item.get_closest_marker("serial") and not item.nodeid.endswith("@serial")
+    ]
+    assert not stray, f"serial tests outside the serial group: {stray}"
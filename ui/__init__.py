@@ -6,7 +6,8 @@ Provides visual feedback through a minimalist status widget.
 import logging
 import threading
 import time
-from typing import Optional, List, Callable
+from collections import deque
+from typing import Optional, List, Callable, Deque, Iterable
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -50,10 +51,15 @@ class WidgetController:
     def __init__(self, max_history: int = 5):
         self.state = JarvisState.IDLE
         self.message = ""
-        self.command_history: List[str] = []
-        self.max_history = max_history
+        # Newest first; maxlen drops the oldest entry on overflow
+        self.command_history: Deque[str] = deque(maxlen=max_history)
         self.callbacks: List[Callable] = []
 
+    @property
+    def max_history(self) -> int:
+        """History limit, fixed by the deque's maxlen."""
+        return self.command_history.maxlen
+
     def set_state(self, state: JarvisState, message: str = ""):
         """Update the current state."""
         self.state = state
@@ -62,9 +68,12 @@ class WidgetController:
 
     def add_command(self, command: str):
         """Add a command to history."""
-        self.command_history.insert(0, command)
-        if len(self.command_history) > self.max_history:
-            self.command_history.pop()
+        self.command_history.appendleft(command)
+        self._notify()
+
+    def add_commands(self, commands: Iterable[str]):
+        """Add several commands in order, notifying callbacks once."""
+        self.command_history.extendleft(commands)
         self._notify()
 
     def add_callback(self, callback: Callable):
@@ -3,6 +3,8 @@ Gestión de dispositivos de audio para JARVIS.
 Permite detectar y seleccionar micrófonos.
 """
 
+import math
+import time
 import sounddevice as sd
 from typing import List, Dict, Optional
 import logging
@@ -16,34 +18,50 @@ class AudioDeviceManager:
     def __init__(self):
         self._devices = []
         self._input_devices = []
-        self.refresh()
+        self._input_device_dicts: List[Dict] = []
+        # Enumerar vía PortAudio es lento; se reutiliza durante unos segundos
+        self._cache_ts = 0.0
+        self._ttl = 5.0
+        self.refresh(force=True)
 
-    def refresh(self):
-        """Actualiza la lista de dispositivos."""
+    def refresh(self, force: bool = False):
+        """
+        Actualiza la lista de dispositivos.
+        Sin force, reutiliza la lista si tiene menos de _ttl segundos.
+        """
+        now = time.monotonic()
+        if not force and self._devices and now - self._cache_ts < self._ttl:
+            return
         try:
             self._devices = sd.query_devices()
             self._input_devices = [
                 d for d in self._devices
                 if d['max_input_channels'] > 0
             ]
+            default_idx = sd.default.device[0]
+            self._input_device_dicts = [
+                {
+                    'index': i,
+                    'name': d['name'],
+                    'channels': d['max_input_channels'],
+                    'sample_rate': int(d['default_samplerate']),
+                    'is_default': i == default_idx
+                }
+                for i, d in enumerate(self._devices)
+                if d['max_input_channels'] > 0
+            ]
+            self._cache_ts = now
         except Exception as e:
             logger.error(f"Error obteniendo dispositivos: {e}")
             self._devices = []
             self._input_devices = []
+            self._input_device_dicts = []
 
     def get_input_devices(self) -> List[Dict]:
         """Retorna lista de dispositivos de entrada (micrófonos)."""
-        return [
-            {
-                'index': i,
-                'name': d['name'],
-                'channels': d['max_input_channels'],
-                'sample_rate': int(d['default_samplerate']),
-                'is_default': i == sd.default.device[0]
-            }
-            for i, d in enumerate(self._devices)
-            if d['max_input_channels'] > 0
-        ]
+        # Consultas repetidas dentro del TTL no vuelven a enumerar PortAudio
+        self.refresh()
+        return list(self._input_device_dicts)
 
     def get_default_input(self) -> Optional[int]:
         """Retorna índice del dispositivo de entrada por defecto."""
@@ -61,8 +79,8 @@ class AudioDeviceManager:
         if not inputs:
             return None
 
-        # Ordenar por: sample_rate (desc), channels (desc)
-        scored = []
+        # Puntuar por: sample_rate, channels; un solo recorrido, sin ordenar
+        best = None
         for dev in inputs:
             score = dev['sample_rate'] + (dev['channels'] * 1000)
             # Bonus si tiene "array" o "mic" en el nombre (mejor para voz)
@@ -71,15 +89,19 @@ class AudioDeviceManager:
                 score += 5000  # Micrófonos array son mejores para voz
             if 'headset' in name_lower or 'auricular' in name_lower:
                 score += 3000  # Headsets suelen tener mejor SNR
-            scored.append((score, dev['index']))
+            # En empate gana el índice mayor, como con el orden descendente
+            if best is None or (score, dev['index']) > best:
+                best = (score, dev['index'])
 
-        scored.sort(reverse=True)
-        return scored[0][1] if scored else None
+        return best[1]
 
     def set_default_input(self, device_index: int) -> bool:
         """Establece el dispositivo de entrada por defecto."""
         try:
             sd.default.device[0] = device_index
+            # Mantener coherente la marca de dispositivo por defecto en caché
+            for dev in self._input_device_dicts:
+                dev['is_default'] = dev['index'] == device_index
             return True
         except Exception as e:
             logger.error(f"Error estableciendo dispositivo: {e}")
@@ -101,8 +123,11 @@ class AudioDeviceManager:
                 device=device_index
             )
             sd.wait()
-            rms = np.sqrt(np.mean(recording.astype(np.float32) ** 2))
-            return float(rms)
+            # Suma de cuadrados acumulada en int64 sin desbordar int16; einsum
+            # convierte por bloques, sin crear una copia ensanchada del audio
+            samples = recording.reshape(-1)
+            sum_sq = np.einsum('i,i->', samples, samples, dtype=np.int64)
+            return math.sqrt(sum_sq / samples.size)
         except Exception as e:
             logger.error(f"Error probando dispositivo {device_index}: {e}")
             return -1
@@ -119,8 +144,15 @@ class AudioDeviceManager:
         return "\n".join(lines)
 
 
+# Instancia singleton
+_device_manager: Optional[AudioDeviceManager] = None
+
+
 def get_device_manager() -> AudioDeviceManager:
     """Singleton para el gestor de dispositivos."""
-    if not hasattr(get_device_manager, '_instance'):
-        get_device_manager._instance = AudioDeviceManager()
-    return get_device_manager._instance
+    global _device_manager
+
+    if _device_manager is None:
+        _device_manager = AudioDeviceManager()
+
+    return _device_manager
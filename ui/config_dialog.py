@@ -179,7 +179,7 @@ class ConfigDialog(QDialog):
 
     def _refresh_devices(self):
         """Refresca la lista de dispositivos."""
-        self.audio_manager.refresh()
+        self.audio_manager.refresh(force=True)
         self._populate_microphones()
 
     def _on_mode_change(self, index):